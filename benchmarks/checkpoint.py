@@ -0,0 +1,166 @@
+# Utils
+import sys
+import random
+from argparse import ArgumentParser
+from os.path import join, dirname, abspath, getsize
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+# Running from the repository root
+ROOT_DIRECTORY = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT_DIRECTORY)
+
+# AI
+import neat
+from simulation.ai.checkpoint import ColumnarCheckpointer, restore_checkpoint, get_checkpoint_path
+from simulation.ai.trainer import NeatTrainer
+
+# Game
+from simulation.flappy_bird_ai import FlappyBirdAI
+from simulation.parallel import ParallelFlappyBirdAI
+
+CONFIG_FILE = join(ROOT_DIRECTORY, "artificial_intelligence", "config-feedforward.txt")
+
+
+def create_config(pop_size):
+    config = neat.Config(
+        neat.DefaultGenome, neat.DefaultReproduction,
+        neat.DefaultSpeciesSet, neat.DefaultStagnation,
+        CONFIG_FILE
+    )
+    config.pop_size = pop_size
+    return config
+
+
+def random_fitness(genomes, config):
+    # Checkpoints do not depend on the game, random fitness keeps the population evolving
+    for _, genome in genomes:
+        genome.fitness = random.random()
+
+
+def genome_state(genome):
+    return (
+        genome.key, genome.fitness,
+        sorted((key, node.bias, node.response, node.activation, node.aggregation) for key, node in genome.nodes.items()),
+        sorted((key, connection.weight, connection.enabled) for key, connection in genome.connections.items()),
+    )
+
+
+def population_state(population):
+    return (
+        population.generation,
+        [genome_state(genome) for genome in population.population.values()],
+        sorted(
+            (key, sorted(species.members), species.representative.key, species.last_improved, species.fitness_history)
+            for key, species in population.species.species.items()
+        ),
+    )
+
+
+def train_game(directory, generations, seed, workers, resume_from=None):
+    # Same wiring as main.py: a new track every generation (seeded by its number), checkpoints every generation
+    if workers > 1:
+        game = ParallelFlappyBirdAI(number_pipes=10, num_workers=workers, seed=seed)
+    else:
+        game = FlappyBirdAI(number_pipes=10, headless=True, seed=seed)
+    fitness = {}
+
+    def simulation(genomes, config):
+        generation, fittest = game.simulation(genomes, config)
+        fitness[generation] = [genome.fitness for _, genome in genomes]
+        return generation, fittest
+
+    try:
+        random.seed(seed)
+        trainer = NeatTrainer(
+            max_generations=generations, simulation=simulation, file_prefix="resume", config_file=CONFIG_FILE,
+            checkpoint_interval=1, load_checkpoint_number=resume_from, checkpoint_directory=directory,
+            log_directory=directory, dump_file=join(directory, "network_dump.json")
+        )
+        trainer.population.config.fitness_threshold = float("inf")
+        game.generation = trainer.population.generation
+        trainer.run_simulation()
+    finally:
+        game.close()
+    return fitness, population_state(trainer.population)
+
+
+def check_resume(generations, seed, workers):
+    # Training straight through and stopping halfway then resuming must play the same tracks and evolve the same
+    with TemporaryDirectory() as directory:
+        fitness, state = train_game(directory, generations, seed, workers)
+    with TemporaryDirectory() as directory:
+        train_game(directory, generations // 2, seed, workers)
+        resumed_fitness, resumed_state = train_game(
+            directory, generations - generations // 2, seed, workers, resume_from=generations // 2
+        )
+    same_fitness = all(fitness[generation] == resumed_fitness[generation] for generation in resumed_fitness)
+    return resumed_state == state and same_fitness
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Pickle versus columnar checkpoints")
+    parser.add_argument("--pop-size", type=int, default=10000)
+    parser.add_argument("--generations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resume-generations", type=int, default=8, help="Generations of the training resume check")
+    parser.add_argument("--workers", type=int, default=1, help="Processes of the training resume check")
+    arguments = parser.parse_args()
+
+    random.seed(arguments.seed)
+    population = neat.Population(create_config(arguments.pop_size))
+
+    with TemporaryDirectory() as directory:
+        # Every generation is saved, the first one fully and the rest incrementally
+        checkpointer = ColumnarCheckpointer(directory=directory, file_prefix="benchmark", full_interval=arguments.generations)
+        saves = []
+
+        class TimedCheckpointer(neat.reporting.BaseReporter):
+            def start_generation(self, generation):
+                checkpointer.start_generation(generation)
+
+            def end_generation(self, config, population, species_set):
+                start = perf_counter()
+                checkpointer.end_generation(config, population, species_set)
+                saves.append(perf_counter() - start)
+
+        population.add_reporter(TimedCheckpointer())
+        population.run(random_fitness, arguments.generations)
+
+        start = perf_counter()
+        checkpointer.close()
+        pending = perf_counter() - start
+
+        # The pickled checkpoint of the same population
+        start = perf_counter()
+        pickler = neat.Checkpointer(filename_prefix=join(directory, "pickle-"))
+        pickler.save_checkpoint(population.config, population.population, population.species, population.generation)
+        pickle_save = perf_counter() - start
+
+        start = perf_counter()
+        neat.Checkpointer.restore_checkpoint(join(directory, "pickle-{}".format(population.generation)))
+        pickle_restore = perf_counter() - start
+
+        start = perf_counter()
+        restored = restore_checkpoint(create_config(arguments.pop_size), directory=directory, file_prefix="benchmark")
+        columnar_restore = perf_counter() - start
+
+        sizes = [
+            getsize(get_checkpoint_path(directory, "benchmark", generation))
+            for generation in range(1, arguments.generations + 1)
+        ]
+        pickle_size = getsize(join(directory, "pickle-{}".format(population.generation)))
+
+    print("pickle    save {:.3f}s (blocking), restore {:.3f}s, {:.1f} MB".format(
+        pickle_save, pickle_restore, pickle_size / 2 ** 20
+    ))
+    print("columnar  save {:.3f}s (blocking, mean) + {:.3f}s pending at exit, restore {:.3f}s".format(
+        sum(saves) / len(saves), pending, columnar_restore
+    ))
+    print("columnar  sizes: full {:.1f} MB, incremental {}".format(
+        sizes[0] / 2 ** 20, ", ".join("{:.1f} MB".format(size / 2 ** 20) for size in sizes[1:])
+    ))
+    print("restored population identical: {}".format(population_state(restored) == population_state(population)))
+    print("resumed training identical (seeded tracks): {}".format(
+        check_resume(arguments.resume_generations, arguments.seed, arguments.workers)
+    ))
@@ -0,0 +1,101 @@
+# Utils
+import sys
+import numpy as np
+from argparse import ArgumentParser
+from math import ceil
+from os.path import dirname, abspath
+from time import perf_counter
+
+# Running from the repository root
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+# Pygame Stuff
+from pygame.mask import from_surface
+
+# Models
+from simulation.models.bird_agent import BirdAgent
+from simulation.models.pipe import DualPipe
+from simulation.models.population import BirdPopulation
+
+
+def random_scenarios(samples, random_state):
+    # Birds around a pipe: from before it reaches the bird until it has been passed
+    bird_width, bird_height = BirdPopulation.BIRD_SIZE
+    pipe_x = random_state.integers(-DualPipe.PIPE_WIDTH - 5, bird_width + 5, samples)
+    bird_y = random_state.uniform(0, 700 - bird_height, samples)
+
+    # Same gaps as PipeTrack
+    top_pipe_y = -DualPipe.PIPE_HEIGHT + np.ceil(700 * random_state.uniform(0.05, 0.60, samples))
+    bottom_pipe_y = DualPipe.PIPE_HEIGHT + top_pipe_y + 5 * 700 // 16
+    return pipe_x, bird_y, top_pipe_y, bottom_pipe_y
+
+
+def pygame_collision(bird_mask, top_pipe_mask, bottom_pipe_mask, bird_position, dual_pipe):
+    # Same test as BirdAgent.check_collision_pygame
+    top_pipe_offset = np.subtract(dual_pipe.top_pipe.position, bird_position)
+    top_pipe_offset[1] = ceil(top_pipe_offset[1])
+    bottom_pipe_offset = np.subtract(dual_pipe.bottom_pipe.position, bird_position)
+    bottom_pipe_offset[1] = ceil(bottom_pipe_offset[1])
+    return bool(
+        bird_mask.overlap(top_pipe_mask, top_pipe_offset) or bird_mask.overlap(bottom_pipe_mask, bottom_pipe_offset)
+    )
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Compares the cost and the accuracy of the collision modes")
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    pipe_x, bird_y, top_pipe_y, bottom_pipe_y = random_scenarios(arguments.samples, np.random.default_rng(arguments.seed))
+    dual_pipes = [
+        DualPipe(pipe_id=0, starting_x=pipe_x[sample], pipes_y=np.array([top_pipe_y[sample], bottom_pipe_y[sample]]))
+        for sample in range(arguments.samples)
+    ]
+    positions = np.column_stack([np.zeros(arguments.samples), bird_y])
+
+    # Masks rebuilt on every call, as BirdAgent used to do
+    start = perf_counter()
+    for position, dual_pipe in zip(positions[:2000], dual_pipes):
+        pygame_collision(
+            from_surface(BirdAgent.ANIMATION[0]), from_surface(DualPipe.TOP_PIPE), from_surface(DualPipe.BOTTOM_PIPE),
+            position, dual_pipe
+        )
+    rebuilt_cost = (perf_counter() - start) / min(2000, arguments.samples)
+
+    # Cached masks, the pixel perfect reference
+    start = perf_counter()
+    reference = np.array([
+        pygame_collision(BirdAgent.MASKS[0], DualPipe.TOP_PIPE_MASK, DualPipe.BOTTOM_PIPE_MASK, position, dual_pipe)
+        for position, dual_pipe in zip(positions, dual_pipes)
+    ])
+    cached_cost = (perf_counter() - start) / arguments.samples
+
+    print("{:<16}{:>14}{:>12}{:>16}{:>16}".format("Mode", "us/check", "Agreement", "False positive", "False negative"))
+    print("{:<16}{:>14.3f}".format("pygame rebuilt", 1e6 * rebuilt_cost))
+    print("{:<16}{:>14.3f}{:>11.2f}%".format("pygame cached", 1e6 * cached_cost, 100.0))
+
+    # Population modes, every scenario is checked as a population of one pipe shared by a batch of birds
+    for collision_mode in BirdPopulation.COLLISION_MODES:
+        population = BirdPopulation(
+            agents=[], starting_position=np.zeros(2), max_height=700, total_pipes=1, closest_pipe=None,
+            collision_mode=collision_mode
+        )
+        population.position = positions
+        start = perf_counter()
+        collisions = np.concatenate([
+            population.check_collision(np.array([sample]), dual_pipe)
+            for sample, dual_pipe in enumerate(dual_pipes)
+        ])
+        cost = (perf_counter() - start) / arguments.samples
+
+        # Batched cost: one pipe against every bird
+        start = perf_counter()
+        population.check_collision(np.arange(arguments.samples), dual_pipes[0])
+        batched_cost = (perf_counter() - start) / arguments.samples
+
+        print("{:<16}{:>14.3f}{:>11.2f}%{:>15.2f}%{:>15.2f}%".format(
+            collision_mode, 1e6 * cost, 100 * np.mean(collisions == reference),
+            100 * np.mean(collisions & ~reference), 100 * np.mean(~collisions & reference)
+        ))
+        print("{:<16}{:>14.3f}".format(collision_mode + " batched", 1e6 * batched_cost))
@@ -0,0 +1,99 @@
+# Utils
+import sys
+import random
+from argparse import ArgumentParser
+from multiprocessing import Process
+from os.path import join, dirname, abspath
+from secrets import token_hex
+from time import perf_counter, sleep
+
+# Running from the repository root
+ROOT_DIRECTORY = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT_DIRECTORY)
+
+# AI
+import neat
+from throughput import follow_gaps, FOLLOW_GAP_MARGIN, FOLLOW_GAP_JITTER
+
+# Game
+from simulation.flappy_bird_ai import FlappyBirdAI
+from simulation.distributed import DistributedFlappyBirdAI, run_worker
+
+CONFIG_FILE = join(ROOT_DIRECTORY, "artificial_intelligence", "config-feedforward.txt")
+
+
+def create_genomes(pop_size, seed):
+    # One population of gap following birds, every game evaluates the same genomes on the same tracks
+    random.seed(seed)
+    config = neat.Config(
+        neat.DefaultGenome, neat.DefaultReproduction,
+        neat.DefaultSpeciesSet, neat.DefaultStagnation,
+        CONFIG_FILE
+    )
+    config.pop_size = pop_size
+    genomes = list(neat.Population(config).population.items())
+    for _, genome in genomes:
+        follow_gaps(genome, config, FOLLOW_GAP_MARGIN + random.uniform(-FOLLOW_GAP_JITTER, FOLLOW_GAP_JITTER))
+    return genomes, config
+
+
+def time_generations(game, genomes, config, generations):
+    # The same seeded generations for every game, their fitness is compared with the serial game's
+    game.generation = 0
+    fitness = []
+    start = perf_counter()
+    for _ in range(generations):
+        game.simulation(genomes, config)
+        fitness.append([genome.fitness for _, genome in genomes])
+    return generations / (perf_counter() - start), fitness
+
+
+def wait_for_workers(game, workers, timeout=30):
+    deadline = perf_counter() + timeout
+    while perf_counter() < deadline:
+        with game.workers_lock:
+            if len(game.workers) + len(game.new_workers) >= workers:
+                return
+        sleep(0.1)
+    raise TimeoutError("Only some of the {} workers connected".format(workers))
+
+
+if __name__ == '__main__':
+    # Coordinator and workers on localhost, one worker process per core is the most a machine can use
+    parser = ArgumentParser(description="Distributed evaluation throughput versus the number of workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--pop-size", type=int, default=1000)
+    parser.add_argument("--pipes", type=int, default=50)
+    parser.add_argument("--generations", type=int, default=3)
+    parser.add_argument("--max-ticks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    genomes, config = create_genomes(arguments.pop_size, arguments.seed)
+    serial = FlappyBirdAI(
+        number_pipes=arguments.pipes, headless=True, seed=arguments.seed, max_ticks=arguments.max_ticks
+    )
+    serial_speed, serial_fitness = time_generations(serial, genomes, config, arguments.generations)
+    print("serial      {:>7.3f} gen/s".format(serial_speed))
+
+    for workers in arguments.workers:
+        # As many shards as workers, on a port picked by the system
+        game = DistributedFlappyBirdAI(
+            number_pipes=arguments.pipes, num_workers=workers, address=("localhost", 0), authkey=token_hex(16),
+            seed=arguments.seed, max_ticks=arguments.max_ticks
+        )
+        processes = [Process(target=run_worker, args=(game.address, game.authkey)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+
+        try:
+            wait_for_workers(game, workers)
+            speed, fitness = time_generations(game, genomes, config, arguments.generations)
+        finally:
+            game.close()
+            for process in processes:
+                process.join()
+
+        print("{:>2} workers  {:>7.3f} gen/s {:>5.2f}x serial, same fitness: {}".format(
+            workers, speed, speed / serial_speed, fitness == serial_fitness
+        ))
@@ -0,0 +1,106 @@
+# Utils
+import sys
+import json
+import tracemalloc
+from argparse import ArgumentParser
+from os.path import dirname, abspath
+from types import SimpleNamespace
+
+# Running from the repository root
+ROOT_DIRECTORY = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT_DIRECTORY)
+
+# Game
+from simulation.flappy_bird_ai import FlappyBirdAI
+from simulation.models.population import BirdPopulation
+from simulation.models.pipe import DualPipe
+
+
+def bytes_per_object(create, count):
+    # Memory still allocated after creating the objects, divided among them
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = create(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del objects
+    return (after - before) / count
+
+
+def create_birds(game, count, push_results=False):
+    # Genomes are not part of the bird's footprint, so they are created beforehand
+    track = game.create_track(0)
+    genomes = [SimpleNamespace(fitness=0.0) for _ in range(count)]
+
+    def create(count):
+        agents = [
+            game._create_agent(bird_id=bird_id, genome=genomes[bird_id], neural_network=None, closest_pipe=track.closest_pipe())
+            for bird_id in range(count)
+        ]
+        if push_results:
+            # A finished generation writes each bird's final state back to its agent
+            BirdPopulation(
+                agents=agents,
+                starting_position=game.bird_starting_position,
+                max_height=game.floor_height,
+                total_pipes=game.number_pipes,
+                closest_pipe=track.closest_pipe()
+            ).push_results()
+        return agents
+
+    return create
+
+
+def create_dual_pipes(count):
+    return [DualPipe(pipe_id=pipe, starting_x=0, pipes_y=(0, 0)) for pipe in range(count)]
+
+
+def create_track(game):
+    def create(count):
+        game.number_pipes = count
+        return game.create_track(0)
+
+    return create
+
+
+def compare(results, baseline, tolerance):
+    # Before and after of every object, flagging the ones that grew more than the tolerance
+    regressions = 0
+    for name, size in results.items():
+        previous = baseline["bytes"].get(name)
+        if previous is None:
+            continue
+        ratio = size / previous
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        regressions += flag != ""
+        print("{:<22} {:>8.1f} -> {:>8.1f} bytes ({:.2f}x) {}".format(name, previous, size, ratio, flag))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Memory footprint of the birds and pipes")
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None, help="Previous results (--output) to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    arguments = parser.parse_args()
+
+    game = FlappyBirdAI(number_pipes=50, headless=True)
+    results = {
+        "bird": bytes_per_object(create_birds(game, arguments.count), arguments.count),
+        "bird_after_generation": bytes_per_object(create_birds(game, arguments.count, push_results=True), arguments.count),
+        "dual_pipe": bytes_per_object(create_dual_pipes, arguments.count),
+        "track_pipe": bytes_per_object(create_track(game), arguments.count),
+    }
+
+    for name, size in results.items():
+        print("{:<22} {:>8.1f} bytes".format(name, size))
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as results_file:
+            json.dump({"count": arguments.count, "bytes": results}, results_file, indent=4)
+
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as baseline_file:
+            sys.exit(1 if compare(results, json.load(baseline_file), arguments.tolerance) else 0)
@@ -0,0 +1,67 @@
+# Utils
+import os
+import sys
+import random
+from argparse import ArgumentParser
+from os.path import join, dirname, abspath
+from time import perf_counter
+
+# Running from the repository root
+ROOT_DIRECTORY = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT_DIRECTORY)
+
+# Without a display, the rendered mode draws into SDL's dummy video driver
+if "DISPLAY" not in os.environ:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# AI
+import neat
+from simulation.flappy_bird_ai import FlappyBirdAI
+
+CONFIG_FILE = join(ROOT_DIRECTORY, "artificial_intelligence", "config-feedforward.txt")
+
+
+def run_generations(headless, generations, number_pipes, seed):
+    # Same seed for NEAT's mutations and for the tracks
+    random.seed(seed)
+    config = neat.Config(
+        neat.DefaultGenome, neat.DefaultReproduction,
+        neat.DefaultSpeciesSet, neat.DefaultStagnation,
+        CONFIG_FILE
+    )
+    population = neat.Population(config)
+    game = FlappyBirdAI(number_pipes=number_pipes, headless=headless, seed=seed)
+
+    # Recording every fitness of every generation
+    fitnesses = []
+
+    def evaluate(genomes, config):
+        game.simulation(genomes, config)
+        fitnesses.append([genome.fitness for _, genome in genomes])
+
+    start = perf_counter()
+    population.run(evaluate, generations)
+    elapsed = perf_counter() - start
+
+    return len(fitnesses) / elapsed, fitnesses
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Compares rendered and headless generations per second")
+    parser.add_argument("--generations", type=int, default=5)
+    parser.add_argument("--pipes", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    rendered_speed, rendered_fitness = run_generations(
+        headless=False, generations=arguments.generations, number_pipes=arguments.pipes, seed=arguments.seed
+    )
+    headless_speed, headless_fitness = run_generations(
+        headless=True, generations=arguments.generations, number_pipes=arguments.pipes, seed=arguments.seed
+    )
+
+    print("Video driver: {}".format(os.environ.get("SDL_VIDEODRIVER", "default")))
+    print("Rendered: {:.3f} generations/s".format(rendered_speed))
+    print("Headless: {:.3f} generations/s".format(headless_speed))
+    print("Speedup: {:.2f}x".format(headless_speed / rendered_speed))
+    print("Identical fitness: {}".format(rendered_fitness == headless_fitness))
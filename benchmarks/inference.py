@@ -0,0 +1,84 @@
+# Utils
+import sys
+import numpy as np
+from argparse import ArgumentParser
+from os.path import join, dirname, abspath
+from time import perf_counter
+
+# Running from the repository root
+ROOT_DIRECTORY = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT_DIRECTORY)
+
+# AI
+import neat
+from neat.nn import FeedForwardNetwork
+from simulation.ai.compiled_network import CompiledNetwork
+
+CONFIG_FILE = join(ROOT_DIRECTORY, "artificial_intelligence", "config-feedforward.txt")
+DUMP_FILE = join(ROOT_DIRECTORY, "artificial_intelligence", "network_dump.json")
+
+
+def create_genome(network, config):
+    # neat-python genome with the same nodes and links as the dumped network
+    genome = config.genome_type(0)
+    for layer in network.layers:
+        for row, node in enumerate(layer["id_nodes"]):
+            node_gene = config.genome_config.node_gene_type(node)
+            node_gene.bias = layer["biases"][row]
+            node_gene.response = layer["responses"][row]
+            node_gene.activation = layer["afunctions"][row]
+            node_gene.aggregation = "sum"
+            genome.nodes[node] = node_gene
+
+            for column, source in enumerate(layer["id_node_inputs"]):
+                if layer["weights"][row, column] != 0:
+                    connection_gene = config.genome_config.connection_gene_type((source, node))
+                    connection_gene.weight = layer["weights"][row, column]
+                    connection_gene.enabled = True
+                    genome.connections[(source, node)] = connection_gene
+    return genome
+
+
+def activations_per_second(activate, rows, batch_size):
+    start = perf_counter()
+    for batch in range(0, len(rows), batch_size):
+        activate(rows[batch:batch + batch_size])
+    return len(rows) / (perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Activations per second of the dumped network")
+    parser.add_argument("--dump", default=DUMP_FILE)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    config = neat.Config(
+        neat.DefaultGenome, neat.DefaultReproduction,
+        neat.DefaultSpeciesSet, neat.DefaultStagnation,
+        CONFIG_FILE
+    )
+    network = CompiledNetwork.load(arguments.dump)
+    reference = FeedForwardNetwork.create(create_genome(network, config), config)
+
+    # Inputs in the range the game produces
+    rows = np.random.default_rng(arguments.seed).uniform(-100, 800, (arguments.rows, len(network.input_nodes)))
+    row_tuples = [tuple(row) for row in rows.tolist()]
+
+    expected = np.array([reference.activate(row) for row in row_tuples])
+    difference = np.abs(network.activate_batch(rows) - expected).max()
+    print("max difference with neat-python: {:.2e}".format(difference))
+
+    results = {
+        "neat-python activate": activations_per_second(lambda batch: [reference.activate(row) for row in batch], row_tuples, 1),
+        "compiled activate": activations_per_second(lambda batch: [network.activate(row) for row in batch], row_tuples[:10000], 1),
+    }
+    for batch_size in arguments.batch_sizes:
+        results["compiled activate_batch ({})".format(batch_size)] = activations_per_second(
+            network.activate_batch, rows if batch_size > 1 else rows[:10000], batch_size
+        )
+
+    baseline = results["neat-python activate"]
+    for name, speed in results.items():
+        print("{:<36} {:>12.0f} activations/s {:>8.1f}x".format(name, speed, speed / baseline))
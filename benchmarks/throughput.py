@@ -0,0 +1,213 @@
+# Utils
+import sys
+import json
+import random
+import resource
+import numpy as np
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from os import makedirs
+from os.path import join, dirname, abspath
+from time import perf_counter
+
+# Running from the repository root
+ROOT_DIRECTORY = dirname(dirname(abspath(__file__)))
+sys.path.insert(0, ROOT_DIRECTORY)
+
+# AI
+import neat
+
+CONFIG_FILE = join(ROOT_DIRECTORY, "artificial_intelligence", "config-feedforward.txt")
+RESULTS_DIRECTORY = join(ROOT_DIRECTORY, "benchmarks", "results")
+
+
+def time_per_call(function, calls):
+    start = perf_counter()
+    for _ in range(calls):
+        function()
+    return (perf_counter() - start) / calls
+
+
+def benchmark_components(game, genomes, config, seed):
+    # Imported here so only the benchmark's own process loads the game
+    from simulation.models.population import BirdPopulation
+    from simulation.ai.compiled_network import CompiledNetwork, BatchedNetworks
+
+    # Pipe track: building it and moving it
+    track = game.create_track(seed)
+    components = {
+        "pipe_track_creation": time_per_call(lambda: game.create_track(seed), 10),
+        "pipe_track_update": time_per_call(track.update, 1000),
+    }
+
+    # A population that never moves, so every bird stays alive
+    networks = [CompiledNetwork.create(genome, config) for _, genome in genomes]
+    agents = [
+        game._create_agent(bird_id=genome_id, genome=genome, neural_network=network, closest_pipe=track.closest_pipe())
+        for (genome_id, genome), network in zip(genomes, networks)
+    ]
+    population = BirdPopulation(
+        agents=agents,
+        starting_position=game.bird_starting_position,
+        max_height=game.floor_height,
+        total_pipes=game.number_pipes,
+        closest_pipe=track.closest_pipe(),
+        networks=BatchedNetworks(networks),
+        collision_mode=game.collision_mode
+    )
+    population.position[:, 1] = np.random.default_rng(seed).uniform(0, game.floor_height, len(agents))
+    index = np.arange(len(agents))
+
+    components["think"] = time_per_call(population.think, 100)
+    components["collision"] = time_per_call(lambda: population.check_collision(index, track.closest_pipe()), 100)
+    return components
+
+
+# Gap following controller: flap once the bird falls this far above the gap's bottom, every bird with its own jitter
+FOLLOW_GAP_MARGIN = 75
+FOLLOW_GAP_JITTER = 5
+
+
+def follow_gaps(genome, config, margin):
+    # Rewrites the genome into a single neuron flapping when the bird's Y passes the bottom pipe's height - margin
+    # (tanh(y - bottom + margin) > 0.5), so the birds survive long tracks and are still NEAT genomes to the game
+    genome_config = config.genome_config
+    genome.nodes = {key: node for key, node in genome.nodes.items() if key in genome_config.output_keys}
+    genome.connections = {}
+    for input_key, weight in ((genome_config.input_keys[0], 1.0), (genome_config.input_keys[3], -1.0)):
+        connection = genome.create_connection(genome_config, input_key, genome_config.output_keys[0])
+        connection.weight = weight
+        connection.enabled = True
+        genome.connections[connection.key] = connection
+
+    output = genome.nodes[genome_config.output_keys[0]]
+    output.bias = margin
+    output.response = 1.0
+
+
+def benchmark_configuration(pop_size, number_pipes, generations, seed, max_ticks, controller="scripted"):
+    # Imported here so only the benchmark's own process loads the game
+    from simulation.flappy_bird_ai import FlappyBirdAI
+    from simulation.utils.profiler import PhaseProfiler
+
+    # Fixed seeds for NEAT and for the tracks
+    random.seed(seed)
+    config = neat.Config(
+        neat.DefaultGenome, neat.DefaultReproduction,
+        neat.DefaultSpeciesSet, neat.DefaultStagnation,
+        CONFIG_FILE
+    )
+    config.pop_size = pop_size
+    population = neat.Population(config)
+    game = FlappyBirdAI(number_pipes=number_pipes, headless=True, seed=seed, max_ticks=max_ticks)
+    game.profiler = PhaseProfiler(log_directory=None)
+
+    # Components, measured on the first generation's genomes
+    components = benchmark_components(game, list(population.population.items()), config, seed)
+
+    # Whole generations, NEAT reproduction included. Untrained networks crash within the first pipes whatever the
+    # track's length, the scripted controller keeps the birds alive until they complete it or reach max_ticks
+    records = []
+    margins = np.random.default_rng(seed)
+
+    def evaluate(genomes, config):
+        if controller == "scripted":
+            for _, genome in genomes:
+                follow_gaps(genome, config, FOLLOW_GAP_MARGIN + margins.uniform(-FOLLOW_GAP_JITTER, FOLLOW_GAP_JITTER))
+        game.simulation(genomes, config)
+        records.append(game.profiler.last_record)
+
+    population.run(evaluate, generations)
+
+    seconds = sum(record["seconds"] for record in records)
+    phases = {
+        phase: sum(record["phases"][phase] for record in records) / len(records)
+        for phase in PhaseProfiler.PHASES
+    }
+    return {
+        "pop_size": pop_size,
+        "number_pipes": number_pipes,
+        "controller": controller,
+        "generations": len(records),
+        "seconds_per_generation": seconds / len(records),
+        "ticks_per_second": sum(record["ticks"] for record in records) / seconds,
+        "ticks_per_generation": sum(record["ticks"] for record in records) / len(records),
+        "bird_ticks_per_second": sum(record["bird_ticks_per_second"] * record["seconds"] for record in records) / seconds,
+        "reproduction_seconds_per_generation": phases["neat"],
+        "phases_seconds_per_generation": phases,
+        "components_seconds_per_call": components,
+        # Kilobytes on Linux
+        "peak_memory_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def compare(results, baseline, tolerance):
+    # Flagging every configuration whose throughput dropped more than the tolerance
+    # (results saved before the scripted controller were all measured with the untrained networks)
+    def configuration(result):
+        return result["pop_size"], result["number_pipes"], result.get("controller", "neat")
+
+    baseline = {configuration(result): result for result in baseline["results"]}
+    regressions = 0
+    for result in results:
+        previous = baseline.get(configuration(result))
+        if previous is None:
+            continue
+        ratio = result["bird_ticks_per_second"] / previous["bird_ticks_per_second"]
+        flag = "REGRESSION" if ratio < 1 - tolerance else ""
+        regressions += flag != ""
+        print("pop {:>6} pipes {:>5}: {:.2f}x bird ticks/s {}".format(
+            result["pop_size"], result["number_pipes"], ratio, flag
+        ))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Simulation throughput and scaling benchmark")
+    parser.add_argument("--pop-sizes", type=int, nargs="+", default=[30, 300, 1000, 10000])
+    parser.add_argument("--pipes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--generations", type=int, default=3)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--controller", choices=("scripted", "neat"), default="scripted",
+        help="Birds following the gaps (surviving long tracks) or the untrained networks"
+    )
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None, help="Previous results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    arguments = parser.parse_args()
+
+    # Every configuration runs in a fresh process, so peak memory is its own
+    results = []
+    for pop_size in arguments.pop_sizes:
+        for number_pipes in arguments.pipes:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                result = executor.submit(
+                    benchmark_configuration,
+                    pop_size, number_pipes, arguments.generations, arguments.seed, arguments.max_ticks,
+                    arguments.controller
+                ).result()
+            results.append(result)
+            print((
+                "pop {:>6} pipes {:>5}: {:>9.0f} ticks/s {:>11.0f} bird ticks/s {:>8.3f} s/gen {:>7.0f} ticks/gen "
+                "{:>7.1f} MB"
+            ).format(
+                pop_size, number_pipes, result["ticks_per_second"], result["bird_ticks_per_second"],
+                result["seconds_per_generation"], result["ticks_per_generation"], result["peak_memory_mb"]
+            ))
+
+    # Saving the results
+    output = arguments.output
+    if output is None:
+        makedirs(RESULTS_DIRECTORY, exist_ok=True)
+        output = join(RESULTS_DIRECTORY, "throughput_{}.json".format(datetime.now().strftime("%Y_%m_%d-%H_%M")))
+    with open(output, "w") as results_file:
+        json.dump({"arguments": vars(arguments), "results": results}, results_file, indent=4)
+    print("Results saved to {}".format(output))
+
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as baseline_file:
+            sys.exit(1 if compare(results, json.load(baseline_file), arguments.tolerance) else 0)
@@ -0,0 +1,22 @@
+# Game
+from simulation.distributed import run_worker, get_authkey, AUTHKEY_VARIABLE
+
+# Utils
+from argparse import ArgumentParser
+
+
+if __name__ == '__main__':
+    # Evaluating genomes for a coordinator (main.py with a coordinator_address), on this or another machine
+    parser = ArgumentParser(description="Evaluate genomes sent by a training coordinator")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6000)
+    parser.add_argument("--authkey", help="Key printed by the coordinator, {} by default".format(AUTHKEY_VARIABLE))
+    parser.add_argument("--retry", type=float, default=30, help="Seconds to wait for the coordinator to listen")
+    arguments = parser.parse_args()
+
+    # There is no default key, anyone with it can send this worker code to run
+    authkey = get_authkey(arguments.authkey)
+    if authkey is None:
+        parser.error("the coordinator's key is required, pass --authkey or set {}".format(AUTHKEY_VARIABLE))
+
+    run_worker((arguments.host, arguments.port), authkey=authkey, retry_seconds=arguments.retry)
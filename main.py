@@ -1,45 +1,148 @@
 # AI
 from simulation.flappy_bird_ai import FlappyBirdAI
+from simulation.parallel import ParallelFlappyBirdAI
+from simulation.distributed import DistributedFlappyBirdAI
 from simulation.models.bird_agent import BirdAgent
-from neat_utility import NeatSetup
+from simulation.ai.trainer import NeatTrainer
+from simulation.ai.telemetry_reporter import TelemetryReporter
 
 
 if __name__ == '__main__':
     # Setting up Game
     '''
         YOU CAN MODIFY THE NUMBER OF PIPES FOR THE GAMES!!!
+        - headless: Train without opening a window (much faster), closing
+            the window goes on training headless
+        - render_every, target_fps: Spectator mode, the game runs at full
+            speed and only every Nth tick (no faster than the FPS) is drawn
+        - render_thread: Draw the window from its own thread
+        - seed: Integer to make the tracks reproducible or None
+        - number_tracks: None to play a new track every generation
+            or an integer to rotate a fixed set of tracks
+        - max_ticks: Ends a generation after this many ticks or None
+        - stop_at_fitness_threshold: Ends a generation as soon as the fittest
+            bird reaches the config's fitness_threshold (single process only)
+        - stagnation_ticks: Ends a generation once no bird has passed a new
+            pipe for this many ticks or None (single process only)
+        - profile: Writes per phase timings of every generation to
+            neat_logs/profile_*.jsonl and adds a summary to the log
+        - evaluation_tracks: Number of tracks every genome plays each
+            generation, all of them in a single batched game loop
+        - track_aggregation: How the fitness of every track is combined,
+            "mean", "min" or a quantile between 0 and 1 (e.g. 0.25)
+        - telemetry: Streams the statistics of every generation (species
+            included) to neat_logs/telemetry_*.jsonl, plot them with
+            plot_telemetry.py
+        - draw_network: Draws the fittest network to svg_growth/flappy_bird_fittest.svg
+            in the background, whenever its topology changes (training never
+            waits for graphviz)
+        - input_normalization: None feeds the networks the raw inputs, "tanh"
+            maps every input to [-1, 1] (a network trained with it must be
+            replayed with it too)
+        - ticks_per_second: Paces a game with a window to this many ticks
+            per second or None to run it as fast as possible
+        - decision_interval: Birds think every this many ticks and do not
+            flap in between, physics still run every tick
+        - record: Saves every bird's flaps to neat_recordings, watch any
+            generation again with play_recording.py
+        - curriculum: Starts on 5 pipe tracks with wider gaps, the tracks
+            double their length and narrow their gaps every time the
+            fittest bird completes one, up to the full track
+        - workers: Number of processes evaluating the genomes,
+            more than 1 trains headless across several CPU cores
+        - coordinator_address: (host, port) to train with the workers that
+            connect to it (evaluation_worker.py) instead, on any machine of
+            a private network (workers run the pickled data they receive).
+            The workers' key is read from FLAPPY_BIRD_AUTHKEY or printed.
+            Shards still running after straggler_timeout seconds are sent
+            to another worker too
     '''
-    game = FlappyBirdAI(
-        number_pipes=50
+    game_options = dict(
+        seed=None,
+        number_tracks=None,
+        max_ticks=None,
+        stop_at_fitness_threshold=False,
+        stagnation_ticks=None,
+        profile=False,
+        evaluation_tracks=1,
+        track_aggregation="mean",
+        telemetry=False,
+        draw_network=True,
+        input_normalization=None,
+        record=False,
+        ticks_per_second=None,
+        decision_interval=1,
+        curriculum=False
     )
 
+    workers = 1
+    coordinator_address = None
+    if coordinator_address is not None:
+        game = DistributedFlappyBirdAI(
+            number_pipes=50,
+            num_workers=max(workers, 2),
+            address=coordinator_address,
+            straggler_timeout=30,
+            **game_options
+        )
+    elif workers > 1:
+        game = ParallelFlappyBirdAI(
+            number_pipes=50,
+            num_workers=workers,
+            **game_options
+        )
+    else:
+        game = FlappyBirdAI(
+            number_pipes=50,
+            headless=False,
+            render_every=1,
+            target_fps=None,
+            render_thread=False,
+            **game_options
+        )
+
     # Setting up NEAT Algorithm
     '''
         YOU CAN MODIFY THE FOLLOWING PARAMETERS:
         - max_generations: The total number of max generations
             that the game will run
+        - checkpoint_interval: Saves the population (as .npz columns) to neat_checkpoints
+            every this many generations or None
         - load_checkpoint_number: You can start the game with
             a fresh generations or start from a checkpoint
             * None: Start from a fresh generation
-            * Integer: Either 10 or 49
+            * Integer: Generation of a saved checkpoint (e.g. 10)
+        - archive: Appends every generation's genomes, parents and fitness
+            to neat_archive, query it with ArchiveReader
+        The fittest network is dumped to artificial_intelligence/network_dump.json
+        once training ends, draw_network draws it to svg_growth while training
     '''
 
-    neatSetup = NeatSetup(
-        max_generations=50,
-        neat_checkpoint_breakpoint=10,
-        file_prefix="flappy_bird",
-        simulation_file=__file__,
-        is_feedforward_network=True,
-        inputs_name=["Bird's Y position", "Closest Pipe's farthest corner's X position", "Top pipe's height", "Bottom pipe's height"],
-        outputs_name=["Flap"],
-
-        load_checkpoint_number=None,
-        # load_checkpoint_number=10
-        config_file=None,
-        simulation=game.simulation,
-
-        logging_function=BirdAgent.log_stats
-    )
+    try:
+        trainer = NeatTrainer(
+            max_generations=50,
+            checkpoint_interval=10,
+            file_prefix="flappy_bird",
+            inputs_name=["Bird's Y position", "Closest Pipe's farthest corner's X position", "Top pipe's height", "Bottom pipe's height"],
+            outputs_name=["Flap"],
+
+            load_checkpoint_number=None,
+            # load_checkpoint_number=10
+            archive=False,
+            simulation=game.simulation,
+
+            logging_function=BirdAgent.log_stats
+        )
+
+        # A resumed run goes on numbering the generations (their seeded tracks and recordings) where it stopped
+        game.generation = trainer.population.generation
+
+        # Species are only known to NEAT, they are added to the game's telemetry
+        if game.telemetry is not None:
+            trainer.add_reporter(TelemetryReporter(game.telemetry))
 
-    # Run
-    neatSetup.run_simulation()
+        # Run
+        trainer.run_simulation()
+    finally:
+        # Writing what is still queued (telemetry, drawings) and closing the window or the workers
+        game.close()
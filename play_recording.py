@@ -0,0 +1,34 @@
+# Game
+from simulation.flappy_bird_ai import FlappyBirdAI
+from simulation.utils.recording import GenerationRecording, get_recording_path, find_latest_recording
+
+# Utils
+from argparse import ArgumentParser
+
+
+if __name__ == '__main__':
+    # Watching a recorded generation again, no network is run
+    parser = ArgumentParser(description="Play a recorded generation")
+    parser.add_argument("--generation", type=int, default=None, help="Latest recorded generation by default")
+    parser.add_argument("--directory", default="neat_recordings")
+    parser.add_argument("--start-tick", type=int, default=0, help="Seek to this tick before drawing")
+    parser.add_argument("--speed", type=float, default=60, help="Ticks per second, 0 to play as fast as possible")
+    parser.add_argument("--render-every", type=int, default=1, help="Draw every Nth tick")
+    parser.add_argument("--headless", action="store_true", help="Only check the recorded fitness")
+    arguments = parser.parse_args()
+
+    recording = GenerationRecording.load(
+        find_latest_recording(arguments.directory) if arguments.generation is None
+        else get_recording_path(arguments.generation, directory=arguments.directory)
+    )
+    game = FlappyBirdAI(
+        number_pipes=recording.layouts.shape[1],
+        headless=arguments.headless,
+        render_every=arguments.render_every,
+        ticks_per_second=arguments.speed or None
+    )
+
+    termination, ticks, fitness = game.play_recording(recording, start_tick=arguments.start_tick)
+    print("Generation {}: {} birds, {} after {} ticks, best fitness {:.2f}".format(
+        recording.generation, len(recording.bird_ids), termination.value, ticks, fitness.max()
+    ))
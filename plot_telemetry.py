@@ -0,0 +1,14 @@
+# Utils
+from argparse import ArgumentParser
+from simulation.utils.telemetry import find_latest_telemetry, read_telemetry, plot_telemetry
+
+
+if __name__ == '__main__':
+    # Plotting a training run's telemetry, the latest one unless a file is given
+    parser = ArgumentParser(description="Plot the telemetry of a training run")
+    parser.add_argument("file", nargs="?", default=None)
+    parser.add_argument("--output", default=None, help="Save the figure instead of showing it")
+    arguments = parser.parse_args()
+
+    file_path = arguments.file if arguments.file is not None else find_latest_telemetry()
+    plot_telemetry(read_telemetry(file_path), output_file=arguments.output)
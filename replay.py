@@ -0,0 +1,33 @@
+# Game
+from simulation.flappy_bird_ai import FlappyBirdAI
+from simulation.ai.compiled_network import CompiledNetwork
+
+# Utils
+from argparse import ArgumentParser
+
+
+if __name__ == '__main__':
+    # Replaying a dumped network, neat-python is not needed
+    parser = ArgumentParser(description="Replay a trained bird on seeded tracks")
+    parser.add_argument("--dump", default="artificial_intelligence/network_dump.json")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--pipes", type=int, default=50)
+    parser.add_argument("--render", action="store_true", help="Watch the replay instead of running it headless")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--normalize", action="store_true", help="The network was trained on inputs normalized to [-1, 1]")
+    arguments = parser.parse_args()
+
+    network = CompiledNetwork.load(arguments.dump)
+    game = FlappyBirdAI(
+        number_pipes=arguments.pipes,
+        headless=not arguments.render,
+        ticks_per_second=arguments.fps if arguments.render else None,
+        input_normalization="tanh" if arguments.normalize else None
+    )
+
+    for seed in arguments.seeds:
+        bird, fitness = game.replay(network, track_seed=seed)
+        print("Track {}: {} pipes passed ({:.2f}%), fitness {:.2f}, {} after {} ticks".format(
+            seed, bird.pipes_passed, 100 * bird.pipes_passed / arguments.pipes, fitness,
+            bird.termination.value, bird.ticks
+        ))
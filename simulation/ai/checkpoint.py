@@ -0,0 +1,323 @@
+# AI
+from neat import Population
+from neat.attributes import BoolAttribute, StringAttribute
+from neat.reporting import BaseReporter
+from neat.species import Species
+
+# Utils
+import random
+import numpy as np
+from copy import copy
+from glob import glob
+from itertools import count
+from os import makedirs, replace
+from os.path import join, basename
+from queue import Queue
+from threading import Thread
+
+
+def get_checkpoint_path(directory, file_prefix, generation):
+    return join(directory, "checkpoint_{}_{}.npz".format(file_prefix, generation))
+
+
+def list_checkpoints(directory, file_prefix):
+    # Generation of every checkpoint in the directory, oldest first
+    prefix = "checkpoint_{}_".format(file_prefix)
+    return sorted(
+        int(basename(path)[len(prefix):-len(".npz")])
+        for path in glob(join(directory, prefix + "*.npz"))
+    )
+
+
+def encode_attributes(genes, gene_type, prefix, columns):
+    # One column per gene attribute, strings are stored as codes into a table of names
+    for attribute in gene_type._gene_attributes:
+        name = "{}_{}".format(prefix, attribute.name)
+        values = [getattr(gene, attribute.name) for gene in genes]
+        if isinstance(attribute, StringAttribute):
+            columns[name + "_names"], columns[name] = np.unique(np.array(values, dtype=str), return_inverse=True)
+        elif isinstance(attribute, BoolAttribute):
+            columns[name] = np.array(values, dtype=bool)
+        else:
+            columns[name] = np.array(values, dtype=float)
+
+
+def decode_attributes(gene_type, prefix, columns, genes):
+    # Python values of every attribute column for the selected genes, ready to be set on them
+    attributes = []
+    for attribute in gene_type._gene_attributes:
+        name = "{}_{}".format(prefix, attribute.name)
+        values = columns[name][genes]
+        if name + "_names" in columns:
+            values = columns[name + "_names"][values]
+        attributes.append((attribute.name, values.tolist()))
+    return attributes
+
+
+def encode_genomes(genomes, genome_config):
+    # Genes of all genomes laid out back to back, the offsets delimit every genome's genes
+    nodes = [node for genome in genomes for node in genome.nodes.values()]
+    connections = [connection for genome in genomes for connection in genome.connections.values()]
+
+    columns = {
+        "genome_keys": np.array([genome.key for genome in genomes], dtype=np.int64),
+        "node_offsets": np.cumsum([0] + [len(genome.nodes) for genome in genomes], dtype=np.int64),
+        "node_keys": np.array([node.key for node in nodes], dtype=np.int64),
+        "connection_offsets": np.cumsum([0] + [len(genome.connections) for genome in genomes], dtype=np.int64),
+        "connection_keys": np.array([connection.key for connection in connections], dtype=np.int64).reshape(-1, 2),
+    }
+    encode_attributes(nodes, genome_config.node_gene_type, "node", columns)
+    encode_attributes(connections, genome_config.connection_gene_type, "connection", columns)
+    return columns
+
+
+def decode_genes(gene_type, keys, attributes):
+    # The genes' constructors only set the key, their attributes are set all at once
+    names = ["key"] + [name for name, _ in attributes]
+    genes = []
+    for values in zip(keys, *(values for _, values in attributes)):
+        gene = gene_type.__new__(gene_type)
+        gene.__dict__.update(zip(names, values))
+        genes.append(gene)
+    return genes
+
+
+def select_genes(offsets, selected):
+    # Indices of the genes of the selected genomes and the offsets of these genomes in them
+    counts = np.diff(offsets)[selected]
+    genes = np.repeat(offsets[:-1][selected] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    return genes, np.concatenate(([0], np.cumsum(counts))).tolist()
+
+
+def decode_genomes(columns, genome_type, genome_config, wanted_keys):
+    # Only the genomes in wanted_keys are rebuilt
+    genome_keys = columns["genome_keys"]
+    selected = np.flatnonzero(np.isin(genome_keys, list(wanted_keys)))
+    if len(selected) == 0:
+        return {}
+
+    node_genes, node_offsets = select_genes(columns["node_offsets"], selected)
+    nodes = decode_genes(
+        genome_config.node_gene_type,
+        columns["node_keys"][node_genes].tolist(),
+        decode_attributes(genome_config.node_gene_type, "node", columns, node_genes)
+    )
+    connection_genes, connection_offsets = select_genes(columns["connection_offsets"], selected)
+    connections = decode_genes(
+        genome_config.connection_gene_type,
+        list(map(tuple, columns["connection_keys"][connection_genes].tolist())),
+        decode_attributes(genome_config.connection_gene_type, "connection", columns, connection_genes)
+    )
+
+    genomes = {}
+    for index, key in enumerate(genome_keys[selected].tolist()):
+        genome = genome_type(key)
+        genome.nodes = {node.key: node for node in nodes[node_offsets[index]:node_offsets[index + 1]]}
+        genome.connections = {
+            connection.key: connection
+            for connection in connections[connection_offsets[index]:connection_offsets[index + 1]]
+        }
+        genomes[key] = genome
+    return genomes
+
+
+def encode_species(species_set):
+    species = list(species_set.species.values())
+    members = [list(s.members) for s in species]
+    return {
+        "species_keys": np.array([s.key for s in species], dtype=np.int64),
+        "species_created": np.array([s.created for s in species], dtype=np.int64),
+        "species_last_improved": np.array([s.last_improved for s in species], dtype=np.int64),
+        "species_representatives": np.array([s.representative.key for s in species], dtype=np.int64),
+        "species_fitness": np.array([s.fitness for s in species], dtype=float),
+        "species_adjusted_fitness": np.array([s.adjusted_fitness for s in species], dtype=float),
+        "species_member_offsets": np.cumsum([0] + [len(m) for m in members], dtype=np.int64),
+        "species_members": np.array([key for m in members for key in m], dtype=np.int64),
+        "species_history_offsets": np.cumsum([0] + [len(s.fitness_history) for s in species], dtype=np.int64),
+        "species_history": np.array([fitness for s in species for fitness in s.fitness_history], dtype=float),
+        "species_indexer": np.array(next(copy(species_set.indexer))),
+    }
+
+
+def decode_species(columns, species_set, population):
+    # NaN marks fitness values that were None
+    def optional(value):
+        return None if np.isnan(value) else float(value)
+
+    member_offsets = columns["species_member_offsets"].tolist()
+    history_offsets = columns["species_history_offsets"].tolist()
+    members = columns["species_members"].tolist()
+    history = columns["species_history"].tolist()
+    for index, key in enumerate(columns["species_keys"].tolist()):
+        species = Species(key, int(columns["species_created"][index]))
+        species.last_improved = int(columns["species_last_improved"][index])
+        species.fitness = optional(columns["species_fitness"][index])
+        species.adjusted_fitness = optional(columns["species_adjusted_fitness"][index])
+        species.fitness_history = history[history_offsets[index]:history_offsets[index + 1]]
+        species.update(
+            representative=population[int(columns["species_representatives"][index])],
+            members={
+                genome_key: population[genome_key]
+                for genome_key in members[member_offsets[index]:member_offsets[index + 1]]
+            }
+        )
+        species_set.species[key] = species
+        species_set.genome_to_species.update(dict.fromkeys(species.members, key))
+
+    species_set.indexer = count(int(columns["species_indexer"]))
+
+
+class ColumnarCheckpointer(BaseReporter):
+    def __init__(
+            self, directory="neat_checkpoints", file_prefix="neat", generation_interval=1, full_interval=10,
+            ancestors=None
+    ):
+        # Every generation_interval generations the population is saved, every full_interval saves the
+        # whole population is written again, the saves in between only write the genomes created since.
+        # ancestors is the reproduction's genome key -> parent keys dictionary (population.reproduction.ancestors),
+        # the parents of the saved population are restored with it
+        makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.file_prefix = file_prefix
+        self.generation_interval = generation_interval
+        self.full_interval = full_interval
+        self.ancestors = ancestors if ancestors is not None else {}
+
+        self.current_generation = None
+        self.previous_generation = -1
+        self.saves_since_full = 0
+        self.written_keys = set()
+
+        # Writing happens on a background thread, training only waits for the columns to be built
+        self.error = None
+        self.queue = Queue()
+        self.thread = Thread(target=self.write_loop, daemon=True)
+        self.thread.start()
+
+    def start_generation(self, generation):
+        self.current_generation = generation
+
+    def end_generation(self, config, population, species_set):
+        if (self.current_generation + 1) % self.generation_interval == 0:
+            self.save_checkpoint(config, population, species_set, self.current_generation + 1)
+
+    def save_checkpoint(self, config, population, species_set, generation):
+        if self.error is not None:
+            raise self.error
+
+        # Genomes never change once created, so only new genomes are written between full saves
+        full = self.previous_generation < 0 or self.saves_since_full >= self.full_interval
+        if full:
+            self.written_keys = set()
+            self.saves_since_full = 0
+        new_genomes = [genome for key, genome in population.items() if key not in self.written_keys]
+
+        # Built on the training thread, the next generation may change the fitness of the survivors
+        node_indexer = config.genome_config.node_indexer
+        version, state, gauss = random.getstate()
+        columns = encode_genomes(new_genomes, config.genome_config)
+        columns.update(encode_species(species_set))
+        columns.update({
+            "generation": np.array(generation),
+            "previous_generation": np.array(-1 if full else self.previous_generation),
+            "population_keys": np.array(list(population), dtype=np.int64),
+            "fitness": np.array([genome.fitness for genome in population.values()], dtype=float),
+            "parent_keys": np.array(
+                [(tuple(self.ancestors.get(key, ())) + (-1, -1))[:2] for key in population], dtype=np.int64
+            ).reshape(-1, 2),
+            "node_indexer": np.array(-1 if node_indexer is None else next(copy(node_indexer))),
+            "random_state": np.array(state, dtype=np.uint64),
+            "random_version": np.array(version),
+            "random_gauss": np.array(np.nan if gauss is None else gauss),
+        })
+
+        self.written_keys.update(genome.key for genome in new_genomes)
+        self.saves_since_full += 1
+        self.previous_generation = generation
+        self.queue.put((get_checkpoint_path(self.directory, self.file_prefix, generation), columns))
+
+    def write_loop(self):
+        while True:
+            path, columns = self.queue.get()
+            try:
+                if path is not None and self.error is None:
+                    # Written next to the checkpoint and renamed, a checkpoint is either complete or missing
+                    with open(path + ".tmp", "wb") as checkpoint_file:
+                        np.savez_compressed(checkpoint_file, **columns)
+                    replace(path + ".tmp", path)
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+
+            if path is None:
+                return
+
+    def flush(self):
+        # Waiting for every pending checkpoint to be written
+        self.queue.join()
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put((None, None))
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+def restore_checkpoint(config, directory="neat_checkpoints", file_prefix="neat", generation=None):
+    # Latest checkpoint, unless a specific generation is requested
+    if generation is None:
+        generations = list_checkpoints(directory, file_prefix)
+        if len(generations) == 0:
+            raise FileNotFoundError("No checkpoints with prefix {} in {}".format(file_prefix, directory))
+        generation = generations[-1]
+
+    with np.load(get_checkpoint_path(directory, file_prefix, generation)) as checkpoint:
+        latest = dict(checkpoint)
+
+    # Following the chain of incremental checkpoints back to the last full one
+    population_keys = latest["population_keys"].tolist()
+    wanted_keys = set(population_keys)
+    population = {}
+    columns = latest
+    while True:
+        population.update(decode_genomes(columns, config.genome_type, config.genome_config, wanted_keys))
+        wanted_keys.difference_update(population)
+        previous_generation = int(columns["previous_generation"])
+        if previous_generation < 0 or len(wanted_keys) == 0:
+            break
+        with np.load(get_checkpoint_path(directory, file_prefix, previous_generation)) as checkpoint:
+            columns = dict(checkpoint)
+
+    if len(wanted_keys) > 0:
+        raise ValueError("Checkpoint {} is missing {} genomes".format(generation, len(wanted_keys)))
+
+    # Same order and fitness as the saved population
+    population = {key: population[key] for key in population_keys}
+    for genome, fitness in zip(population.values(), latest["fitness"].tolist()):
+        genome.fitness = None if np.isnan(fitness) else fitness
+
+    # Species, random state and counters, so the training resumes where it stopped
+    species_set = config.species_set_type(config.species_set_config, None)
+    decode_species(latest, species_set, population)
+
+    gauss = float(latest["random_gauss"])
+    random.setstate((int(latest["random_version"]), tuple(latest["random_state"].tolist()), None if np.isnan(gauss) else gauss))
+
+    node_indexer = int(latest["node_indexer"])
+    config.genome_config.node_indexer = None if node_indexer < 0 else count(node_indexer)
+
+    neat_population = Population(config, initial_state=(population, species_set, int(latest["generation"])))
+    species_set.reporters = neat_population.reporters
+    neat_population.reproduction.genome_indexer = count(max(population_keys) + 1)
+
+    # Parents of the population (-1 marks no parent), for the reporters that follow the lineage
+    if "parent_keys" in latest:
+        neat_population.reproduction.ancestors = {
+            key: tuple(parent for parent in parents if parent >= 0)
+            for key, parents in zip(population_keys, latest["parent_keys"].tolist())
+        }
+    return neat_population
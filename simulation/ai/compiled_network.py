@@ -0,0 +1,249 @@
+# Utils
+import re
+import json
+import numpy as np
+
+
+# NumPy versions of neat-python's activation functions
+ACTIVATIONS = {
+    "sigmoid": lambda z: 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0))),
+    "tanh": lambda z: np.tanh(np.clip(2.5 * z, -60.0, 60.0)),
+    "sin": lambda z: np.sin(np.clip(5.0 * z, -60.0, 60.0)),
+    "gauss": lambda z: np.exp(-5.0 * np.clip(z, -3.4, 3.4) ** 2),
+    "relu": lambda z: np.maximum(z, 0.0),
+    "softplus": lambda z: 0.2 * np.log(1 + np.exp(np.clip(5.0 * z, -60.0, 60.0))),
+    "identity": lambda z: z,
+    "clamped": lambda z: np.clip(z, -1.0, 1.0),
+}
+
+
+def activate_nodes(activations, z):
+    # Applying every node's own activation function
+    activations = np.broadcast_to(activations, z.shape)
+    output = np.empty_like(z)
+    for name in np.unique(activations):
+        nodes = activations == name
+        output[nodes] = ACTIVATIONS[name](z[nodes])
+    return output
+
+
+class CompiledNetwork:
+    def __init__(self, input_nodes, output_nodes, layers):
+        # Network's interface
+        self.input_nodes = list(input_nodes)
+        self.output_nodes = list(output_nodes)
+
+        # Every layer holds: id_node_inputs, id_nodes, weights, biases, responses and afunctions
+        self.layers = layers
+
+    @staticmethod
+    def create(genome, config):
+        # Same node evaluation order and links that neat-python would use (only compiling needs neat-python)
+        from neat.nn import FeedForwardNetwork
+        network = FeedForwardNetwork.create(genome, config)
+
+        # Grouping the nodes in layers by their depth
+        depth = {node: 0 for node in network.input_nodes}
+        grouped_nodes = {}
+        for node, _, _, bias, response, links in network.node_evals:
+            # Links coming from nodes that are never evaluated do not contribute
+            links = [(source, weight) for source, weight in links if source in depth]
+            depth[node] = 1 + max((depth[source] for source, _ in links), default=0)
+
+            node_gene = genome.nodes[node]
+            if node_gene.aggregation != "sum":
+                raise ValueError("Unsupported aggregation function: {}".format(node_gene.aggregation))
+            if node_gene.activation not in ACTIVATIONS:
+                raise ValueError("Unsupported activation function: {}".format(node_gene.activation))
+
+            grouped_nodes.setdefault(depth[node], []).append(
+                (node, node_gene.activation, bias, response, links)
+            )
+
+        # Building the dense matrices of every layer
+        layers = []
+        for layer_depth in sorted(grouped_nodes):
+            nodes = grouped_nodes[layer_depth]
+            id_node_inputs = sorted({source for *_, links in nodes for source, _ in links})
+            columns = {source: column for column, source in enumerate(id_node_inputs)}
+
+            weights = np.zeros((len(nodes), len(id_node_inputs)))
+            for row, (*_, links) in enumerate(nodes):
+                for source, weight in links:
+                    weights[row, columns[source]] += weight
+
+            layers.append({
+                "id_node_inputs": id_node_inputs,
+                "id_nodes": [node for node, *_ in nodes],
+                "weights": weights,
+                "biases": np.array([bias for _, _, bias, _, _ in nodes]),
+                "responses": np.array([response for _, _, _, response, _ in nodes]),
+                "afunctions": np.array([activation for _, activation, *_ in nodes]),
+            })
+
+        return CompiledNetwork(
+            input_nodes=network.input_nodes,
+            output_nodes=network.output_nodes,
+            layers=layers
+        )
+
+    @staticmethod
+    def from_dump(dump):
+        # Network dumps name every input and output with its node id in parentheses, "Flap (0)"
+        def node_ids(names, default_ids):
+            matches = [re.search(r"\((-?\d+)\)\s*$", name) for name in names]
+            if all(matches):
+                return [int(match.group(1)) for match in matches]
+            return list(default_ids)
+
+        return CompiledNetwork(
+            input_nodes=node_ids(dump["inputs"], range(-1, -len(dump["inputs"]) - 1, -1)),
+            output_nodes=node_ids(dump["outputs"], range(len(dump["outputs"]))),
+            layers=[
+                {
+                    "id_node_inputs": list(layer["id_node_inputs"]),
+                    "id_nodes": list(layer["id_nodes"]),
+                    "weights": np.array(layer["weights"], dtype=float).reshape(len(layer["id_nodes"]), -1),
+                    "biases": np.array(layer["biases"], dtype=float),
+                    # Dumps without responses come from networks whose responses are all 1
+                    "responses": np.array(layer.get("responses", np.ones(len(layer["id_nodes"]))), dtype=float),
+                    "afunctions": np.array(layer["afunctions"]),
+                }
+                for layer in dump["layers"]
+            ]
+        )
+
+    def to_dump(self, inputs_name=None, outputs_name=None):
+        # Same layout as artificial_intelligence/network_dump.json, plus the responses
+        def named(names, nodes):
+            names = names if names is not None else ["Node"] * len(nodes)
+            return ["{} ({})".format(name, node) for name, node in zip(names, nodes)]
+
+        return {
+            "inputs": named(inputs_name, self.input_nodes),
+            "outputs": named(outputs_name, self.output_nodes),
+            "layers": [
+                {
+                    "layer": layer_index,
+                    "id_node_inputs": [int(node) for node in layer["id_node_inputs"]],
+                    "id_nodes": [int(node) for node in layer["id_nodes"]],
+                    "weights": layer["weights"].tolist(),
+                    "biases": layer["biases"].tolist(),
+                    "responses": layer["responses"].tolist(),
+                    "afunctions": layer["afunctions"].tolist(),
+                }
+                for layer_index, layer in enumerate(self.layers)
+            ]
+        }
+
+    @staticmethod
+    def load(file_path):
+        with open(file_path) as dump_file:
+            return CompiledNetwork.from_dump(json.load(dump_file))
+
+    def save(self, file_path, inputs_name=None, outputs_name=None):
+        with open(file_path, "w") as dump_file:
+            json.dump(self.to_dump(inputs_name=inputs_name, outputs_name=outputs_name), dump_file, indent=4)
+
+    def activate(self, inputs):
+        # Single forward pass, same interface as neat-python's networks
+        return list(self.activate_batch(np.array([inputs], dtype=float))[0])
+
+    def activate_batch(self, inputs):
+        # Forward pass of many input rows at once
+        values = {node: inputs[:, column] for column, node in enumerate(self.input_nodes)}
+        zeros = np.zeros(len(inputs))
+
+        for layer in self.layers:
+            layer_inputs = np.zeros((len(inputs), len(layer["id_node_inputs"])))
+            for column, node in enumerate(layer["id_node_inputs"]):
+                layer_inputs[:, column] = values[node]
+
+            z = layer["biases"] + layer["responses"] * (layer_inputs @ layer["weights"].T)
+            outputs = activate_nodes(layer["afunctions"], z)
+            for column, node in enumerate(layer["id_nodes"]):
+                values[node] = outputs[:, column]
+
+        # Outputs that are never evaluated stay at 0, as in neat-python
+        return np.column_stack([values.get(node, zeros) for node in self.output_nodes])
+
+
+class BatchedNetworks:
+    def __init__(self, networks):
+        # Every network evaluates the same inputs and outputs
+        self.size = len(networks)
+        self.input_nodes = networks[0].input_nodes
+        self.output_nodes = networks[0].output_nodes
+        number_inputs = len(self.input_nodes)
+
+        # Every network's nodes live in its own row of a shared state matrix:
+        # inputs first, outputs after them and hidden nodes at the end
+        slots = []
+        for network in networks:
+            network_slots = {node: slot for slot, node in enumerate(self.input_nodes + self.output_nodes)}
+            for layer in network.layers:
+                for node in layer["id_nodes"]:
+                    network_slots.setdefault(node, len(network_slots))
+            slots.append(network_slots)
+
+        # Last slot is a scratch column that absorbs the padding of smaller networks
+        self.state_size = max(len(network_slots) for network_slots in slots) + 1
+        self.scratch_slot = self.state_size - 1
+        self.output_slots = np.arange(number_inputs, number_inputs + len(self.output_nodes))
+
+        # Padding every network to the deepest one and to the widest layer of every depth
+        depth = max(len(network.layers) for network in networks)
+        self.layers = []
+        for layer_index in range(depth):
+            width = max(
+                len(network.layers[layer_index]["id_nodes"]) if layer_index < len(network.layers) else 0
+                for network in networks
+            )
+            weights = np.zeros((self.size, self.state_size, width))
+            biases = np.zeros((self.size, width))
+            responses = np.zeros((self.size, width))
+            activations = np.full((self.size, width), None, dtype=object)
+            targets = np.full((self.size, width), self.scratch_slot)
+
+            for row, (network, network_slots) in enumerate(zip(networks, slots)):
+                if layer_index >= len(network.layers):
+                    continue
+                layer = network.layers[layer_index]
+                nodes = len(layer["id_nodes"])
+                sources = [network_slots[node] for node in layer["id_node_inputs"]]
+                weights[row, sources, :nodes] = layer["weights"].T
+                biases[row, :nodes] = layer["biases"]
+                responses[row, :nodes] = layer["responses"]
+                activations[row, :nodes] = layer["afunctions"]
+                targets[row, :nodes] = [network_slots[node] for node in layer["id_nodes"]]
+
+            # Padding uses one of the layer's activation functions, so uniform layers need a single call
+            activations[activations == None] = next(name for name in activations.flat if name is not None)
+            activations = activations.astype(str)
+            if (activations == activations.flat[0]).all():
+                activations = activations.flat[0]
+
+            self.layers.append((weights, biases, responses, activations, targets))
+
+    def activate(self, rows, inputs):
+        # Forward pass of the networks in rows (None for every network in order), one input row each
+        state = np.zeros((len(inputs), self.state_size))
+        state[:, :inputs.shape[1]] = inputs
+
+        state_rows = np.arange(len(inputs))[:, np.newaxis]
+
+        # Gathering the rows is skipped when every network is evaluated
+        if rows is None:
+            rows = slice(None)
+
+        for weights, biases, responses, activations, targets in self.layers:
+            z = biases[rows] + responses[rows] * np.matmul(state[:, np.newaxis, :], weights[rows])[:, 0, :]
+            if isinstance(activations, str):
+                state[state_rows, targets[rows]] = ACTIVATIONS[activations](z)
+            else:
+                state[state_rows, targets[rows]] = activate_nodes(activations[rows], z)
+
+            # Padding must never feed the next layers
+            state[:, self.scratch_slot] = 0
+
+        return state[:, self.output_slots]
@@ -0,0 +1,284 @@
+# AI
+from neat.attributes import BoolAttribute, StringAttribute
+from neat.reporting import BaseReporter
+
+# Utils
+import json
+import numpy as np
+from os import makedirs, replace
+from os.path import join, exists
+
+# Tables of the archive and their fixed columns: (name, dtype, trailing shape)
+TABLES = {
+    # One row per generation, delimiting its evaluations
+    "generations": [
+        ("generation", np.int64, ()), ("evaluation_offset", np.int64, ()), ("evaluation_count", np.int64, ()),
+    ],
+    # One row per genome and generation it was evaluated in
+    "evaluations": [
+        ("generation", np.int64, ()), ("genome_key", np.int64, ()), ("fitness", np.float64, ()),
+        ("species_key", np.int64, ()),
+    ],
+    # One row per genome, written the first time it is evaluated, delimiting its genes (fitter parent first,
+    # -1 marks no parent)
+    "genomes": [
+        ("key", np.int64, ()), ("parent_keys", np.int64, (2,)), ("generation", np.int64, ()),
+        ("node_offset", np.int64, ()), ("node_count", np.int64, ()),
+        ("connection_offset", np.int64, ()), ("connection_count", np.int64, ()),
+    ],
+    "nodes": [("key", np.int64, ())],
+    "connections": [("key", np.int64, (2,))],
+}
+
+
+def get_gene_columns(gene_type):
+    # One column per gene attribute, strings (str) are stored as codes into a table of names that only grows
+    columns = []
+    for attribute in gene_type._gene_attributes:
+        if isinstance(attribute, StringAttribute):
+            columns.append((attribute.name, str, ()))
+        elif isinstance(attribute, BoolAttribute):
+            columns.append((attribute.name, np.bool_, ()))
+        else:
+            columns.append((attribute.name, np.float64, ()))
+    return columns
+
+
+class GenomeArchive(BaseReporter):
+    def __init__(self, directory="neat_archive", ancestors=None):
+        # Every column is a raw binary file that only grows, the manifest records how many rows of each are
+        # complete (rows written after it are ignored, e.g. after a crash). ancestors is the reproduction's
+        # genome key -> parent keys dictionary (population.reproduction.ancestors)
+        makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ancestors = ancestors if ancestors is not None else {}
+        self.generation = None
+
+        self.manifest_path = join(directory, "manifest.json")
+        if exists(self.manifest_path):
+            with open(self.manifest_path) as manifest_file:
+                self.manifest = json.load(manifest_file)
+        else:
+            self.manifest = {"tables": {}, "names": {}}
+
+        # Genomes are archived once, the generations after only add their fitness. The fitness of the last
+        # generation orders the parents of the next one's genomes
+        self.archived_keys = set()
+        self.parents_fitness = {}
+        if "genomes" in self.manifest["tables"]:
+            reader = ArchiveReader(directory)
+            self.archived_keys.update(reader.column("genomes", "key").tolist())
+            if len(reader.get_generations()) > 0:
+                evaluations = reader.get_evaluations(reader.get_generations()[-1])
+                self.parents_fitness = dict(zip(evaluations["genome_key"].tolist(), evaluations["fitness"].tolist()))
+
+    def start_generation(self, generation):
+        # NEAT counts generations from 0, the game from 1
+        self.generation = generation + 1
+
+    def get_columns(self, table, config):
+        columns = list(TABLES[table])
+        if table == "nodes":
+            columns += get_gene_columns(config.genome_config.node_gene_type)
+        elif table == "connections":
+            columns += get_gene_columns(config.genome_config.connection_gene_type)
+        return columns
+
+    def encode_names(self, table, name, values):
+        names = self.manifest["names"].setdefault("{}.{}".format(table, name), [])
+        codes = {value: code for code, value in enumerate(names)}
+        for value in values:
+            if value not in codes:
+                codes[value] = len(names)
+                names.append(value)
+        return [codes[value] for value in values]
+
+    def get_parent_keys(self, key):
+        # neat-python records the parents in the order they were picked, crossover takes the genes'
+        # structure from the fitter one (the second on a tie), which goes first
+        parents = tuple(self.ancestors.get(key, ()))
+        if len(parents) == 2 and parents[0] in self.parents_fitness and parents[1] in self.parents_fitness:
+            if not self.parents_fitness[parents[0]] > self.parents_fitness[parents[1]]:
+                parents = parents[::-1]
+        return (parents + (-1, -1))[:2]
+
+    def append(self, table, rows, config):
+        # Columns first, the manifest is only updated once every column holds the new rows
+        state = self.manifest["tables"].setdefault(table, {"rows": 0, "columns": {}})
+        for name, dtype, shape in self.get_columns(table, config):
+            values = rows[name]
+            if dtype is str:
+                values, dtype = self.encode_names(table, name, values), np.int32
+            column = np.array(values, dtype=dtype).reshape((-1,) + shape)
+
+            # Rows past the manifest's count were never committed, they are overwritten
+            path = join(self.directory, "{}.{}.bin".format(table, name))
+            with open(path, "r+b" if exists(path) else "wb") as column_file:
+                column_file.seek(state["rows"] * column.itemsize * int(np.prod(shape)))
+                column_file.write(column.tobytes())
+                column_file.truncate()
+            state["columns"][name] = {"dtype": np.dtype(dtype).str, "shape": list(shape)}
+        state["rows"] += len(rows[TABLES[table][0][0]])
+
+    def post_evaluate(self, config, population, species, best_genome):
+        new_genomes = [genome for key, genome in population.items() if key not in self.archived_keys]
+        nodes = [node for genome in new_genomes for node in genome.nodes.values()]
+        connections = [connection for genome in new_genomes for connection in genome.connections.values()]
+
+        # Genes of the new genomes, back to back
+        node_offset = self.manifest["tables"].get("nodes", {}).get("rows", 0)
+        connection_offset = self.manifest["tables"].get("connections", {}).get("rows", 0)
+        node_counts = [len(genome.nodes) for genome in new_genomes]
+        connection_counts = [len(genome.connections) for genome in new_genomes]
+        for table, genes in (("nodes", nodes), ("connections", connections)):
+            rows = {
+                name: [getattr(gene, name) for gene in genes]
+                for name, _, _ in self.get_columns(table, config)
+            }
+            self.append(table, rows, config)
+
+        self.append("genomes", {
+            "key": [genome.key for genome in new_genomes],
+            "parent_keys": [self.get_parent_keys(genome.key) for genome in new_genomes],
+            "generation": [self.generation] * len(new_genomes),
+            "node_offset": (node_offset + np.cumsum([0] + node_counts[:-1])).tolist() if new_genomes else [],
+            "node_count": node_counts,
+            "connection_offset": (
+                (connection_offset + np.cumsum([0] + connection_counts[:-1])).tolist() if new_genomes else []
+            ),
+            "connection_count": connection_counts,
+        }, config)
+
+        # Fitness of every genome of the generation
+        evaluation_offset = self.manifest["tables"].get("evaluations", {}).get("rows", 0)
+        self.append("evaluations", {
+            "generation": [self.generation] * len(population),
+            "genome_key": list(population),
+            "fitness": [np.nan if genome.fitness is None else genome.fitness for genome in population.values()],
+            "species_key": [species.genome_to_species.get(key, -1) for key in population],
+        }, config)
+        self.append("generations", {
+            "generation": [self.generation],
+            "evaluation_offset": [evaluation_offset],
+            "evaluation_count": [len(population)],
+        }, config)
+
+        # Committing the generation
+        with open(self.manifest_path + ".tmp", "w") as manifest_file:
+            json.dump(self.manifest, manifest_file)
+        replace(self.manifest_path + ".tmp", self.manifest_path)
+        self.archived_keys.update(genome.key for genome in new_genomes)
+        self.parents_fitness = {key: genome.fitness for key, genome in population.items()}
+
+
+class ArchiveReader:
+    def __init__(self, directory="neat_archive"):
+        # Columns are memory-mapped on demand, only the pages a query touches are read
+        self.directory = directory
+        with open(join(directory, "manifest.json")) as manifest_file:
+            self.manifest = json.load(manifest_file)
+        self.columns = {}
+        self.genome_rows = None
+
+    def column(self, table, name):
+        key = "{}.{}".format(table, name)
+        if key not in self.columns:
+            state = self.manifest["tables"][table]
+            column = state["columns"][name]
+            if state["rows"] == 0:
+                self.columns[key] = np.empty([0] + column["shape"], dtype=column["dtype"])
+            else:
+                self.columns[key] = np.memmap(
+                    join(self.directory, "{}.bin".format(key)), dtype=column["dtype"], mode="r",
+                    shape=tuple([state["rows"]] + column["shape"])
+                )
+        return self.columns[key]
+
+    def names(self, table, name):
+        return self.manifest["names"].get("{}.{}".format(table, name), [])
+
+    def get_generations(self):
+        return np.asarray(self.column("generations", "generation"))
+
+    def get_evaluations(self, generation):
+        # Genome keys, fitness and species of a generation
+        index = np.searchsorted(self.get_generations(), generation)
+        offset = int(self.column("generations", "evaluation_offset")[index])
+        rows = slice(offset, offset + int(self.column("generations", "evaluation_count")[index]))
+        return {
+            name: np.asarray(self.column("evaluations", name)[rows])
+            for name in ("genome_key", "fitness", "species_key")
+        }
+
+    def reduce_generations(self, values):
+        # Sum, max and min of a column of the evaluations for every generation, in a single pass
+        offsets = np.asarray(self.column("generations", "evaluation_offset"))
+        if len(offsets) == 0:
+            return np.empty(0), np.empty(0), np.empty(0)
+        return np.add.reduceat(values, offsets), np.fmax.reduceat(values, offsets), np.fmin.reduceat(values, offsets)
+
+    def get_fitness_over_time(self):
+        # Max, mean and min fitness of every generation
+        total, maximum, minimum = self.reduce_generations(self.column("evaluations", "fitness"))
+        return {
+            "generation": self.get_generations(),
+            "max": maximum,
+            "mean": total / np.asarray(self.column("generations", "evaluation_count")),
+            "min": minimum,
+        }
+
+    def get_genome_rows(self, keys):
+        # Genome keys are not always archived in order (e.g. resumed runs), so they are sorted once
+        if self.genome_rows is None:
+            archived_keys = np.asarray(self.column("genomes", "key"))
+            order = np.argsort(archived_keys, kind="stable")
+            self.genome_rows = (archived_keys[order], order)
+        archived_keys, order = self.genome_rows
+
+        keys = np.asarray(keys)
+        index = np.minimum(np.searchsorted(archived_keys, keys), len(archived_keys) - 1)
+        missing = archived_keys[index] != keys if len(archived_keys) else np.ones(keys.shape, dtype=bool)
+        if np.any(missing):
+            raise KeyError("Genomes {} are not archived".format(np.atleast_1d(keys[missing]).tolist()))
+        return order[index]
+
+    def get_genome_row(self, key):
+        return int(self.get_genome_rows([key])[0])
+
+    def get_lineage(self, key, max_depth=None):
+        # The genome and its ancestors, following the fitter parent (the one crossover took the structure from)
+        lineage = []
+        parent_keys = self.column("genomes", "parent_keys")
+        while key >= 0 and (max_depth is None or len(lineage) <= max_depth):
+            try:
+                row = self.get_genome_row(key)
+            except KeyError:
+                break
+            lineage.append(key)
+            key = int(parent_keys[row, 0])
+        return lineage
+
+    def get_topology_growth(self):
+        # Mean and max number of nodes and connections of every generation's genomes
+        rows = self.get_genome_rows(self.column("evaluations", "genome_key"))
+        counts = np.asarray(self.column("generations", "evaluation_count"))
+        growth = {"generation": self.get_generations()}
+        for name in ("node", "connection"):
+            total, maximum, _ = self.reduce_generations(np.asarray(self.column("genomes", name + "_count"))[rows])
+            growth[name + "s_mean"], growth[name + "s_max"] = total / counts, maximum
+        return growth
+
+    def get_genes(self, key):
+        # Columns of a genome's nodes and connections, strings decoded
+        row = self.get_genome_row(key)
+        genes = {}
+        for table in ("nodes", "connections"):
+            offset = int(self.column("genomes", table[:-1] + "_offset")[row])
+            count = int(self.column("genomes", table[:-1] + "_count")[row])
+            genes[table] = {}
+            for name in self.manifest["tables"][table]["columns"]:
+                values = np.asarray(self.column(table, name)[offset:offset + count])
+                if self.names(table, name):
+                    values = np.array(self.names(table, name))[values]
+                genes[table][name] = values
+        return genes
@@ -0,0 +1,105 @@
+# Utils
+import warnings
+from os import makedirs
+from os.path import join
+from threading import Thread, Condition
+
+
+class NetworkDrawer:
+    # Same look as the graphs in svg_growth
+    NODE_ATTRIBUTES = {"shape": "circle", "fontsize": "9", "height": "0.2", "width": "0.2"}
+
+    def __init__(self, directory="svg_growth", file_prefix="flappy_bird", node_names=None):
+        # The graph's source is written to directory/<file_prefix>_fittest and the drawing next to it, as an SVG
+        makedirs(directory, exist_ok=True)
+        self.file_path = join(directory, "{}_fittest".format(file_prefix))
+        self.node_names = node_names if node_names is not None else {}
+
+        # Topology of the last network sent to the drawer, networks with the same one are not drawn again
+        self.last_topology = None
+        self.drawn = 0
+        self.error = None
+
+        # Graphviz runs on its own thread, only the latest network waiting to be drawn is kept
+        self.closed = False
+        self.pending_network = None
+        self.condition = Condition()
+        self.thread = Thread(target=self.draw_loop, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def get_topology(genome):
+        # Nodes and enabled connections, the weights do not matter
+        return (
+            tuple(sorted(genome.nodes)),
+            tuple(sorted(key for key, connection in genome.connections.items() if connection.enabled))
+        )
+
+    def submit(self, genome, config):
+        topology = NetworkDrawer.get_topology(genome)
+        if topology == self.last_topology or self.error is not None:
+            return False
+        self.last_topology = topology
+
+        # Copied, so the genome can keep evolving while it is drawn
+        network = {
+            "inputs": list(config.genome_config.input_keys),
+            "outputs": list(config.genome_config.output_keys),
+            "nodes": list(genome.nodes),
+            "connections": [
+                (key, connection.weight, connection.enabled) for key, connection in genome.connections.items()
+            ],
+        }
+        with self.condition:
+            self.pending_network = network
+            self.condition.notify()
+        return True
+
+    def draw_loop(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending_network is not None or self.closed)
+                network, self.pending_network = self.pending_network, None
+
+            if network is not None:
+                try:
+                    self.draw(network)
+                    self.drawn += 1
+                except Exception as error:
+                    # Drawing is optional, training goes on without it
+                    self.error = error
+                    warnings.warn("Network drawing disabled: {}".format(error))
+                    return
+            elif self.closed:
+                return
+
+    def draw(self, network):
+        # Graphviz is only imported by the drawer's thread
+        from graphviz import Digraph
+
+        graph = Digraph(format="svg", node_attr=NetworkDrawer.NODE_ATTRIBUTES)
+        for node in network["inputs"]:
+            graph.node(self.node_names.get(node, str(node)), style="filled", shape="box", fillcolor="lightgray")
+        for node in network["outputs"]:
+            graph.node(self.node_names.get(node, str(node)), style="filled", fillcolor="lightblue")
+        for node in network["nodes"]:
+            if node not in network["outputs"]:
+                graph.node(self.node_names.get(node, str(node)), style="filled", fillcolor="white")
+
+        # Green for positive weights, red for negative ones, dotted when disabled
+        for (source, target), weight, enabled in network["connections"]:
+            graph.edge(
+                self.node_names.get(source, str(source)), self.node_names.get(target, str(target)),
+                style="solid" if enabled else "dotted",
+                color="green" if weight > 0 else "red",
+                penwidth=str(0.1 + abs(weight / 5.0))
+            )
+
+        graph.render(self.file_path)
+
+    def close(self):
+        # Finishing the drawing in progress and the one waiting, if any
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
@@ -0,0 +1,17 @@
+# AI
+from neat.reporting import BaseReporter
+
+
+class TelemetryReporter(BaseReporter):
+    def __init__(self, writer):
+        # Species of every generation, for populations whose reporters can be extended
+        self.writer = writer
+        self.generation = None
+
+    def start_generation(self, generation):
+        # NEAT counts generations from 0, the game from 1
+        self.generation = generation + 1
+
+    def post_evaluate(self, config, population, species, best_genome):
+        sizes = sorted((len(s.members) for s in species.species.values()), reverse=True)
+        self.writer.write({"generation": self.generation, "species": len(sizes), "species_sizes": sizes})
@@ -0,0 +1,105 @@
+# AI
+from neat import Config, DefaultGenome, DefaultReproduction, DefaultSpeciesSet, DefaultStagnation
+from neat import Population, StdOutReporter
+from .compiled_network import CompiledNetwork
+from .checkpoint import ColumnarCheckpointer, restore_checkpoint
+from .genome_archive import GenomeArchive
+
+# Utils
+import logging
+from datetime import datetime
+from os import makedirs
+from os.path import join
+
+
+class NeatTrainer:
+    def __init__(
+            self, max_generations, simulation, file_prefix="neat", logging_function=None,
+            inputs_name=None, outputs_name=None, config_file="artificial_intelligence/config-feedforward.txt",
+            checkpoint_interval=10, load_checkpoint_number=None, checkpoint_directory="neat_checkpoints",
+            log_directory="neat_logs", dump_file="artificial_intelligence/network_dump.json", archive=False
+    ):
+        # Trains the simulation's birds for max_generations, the simulation returns (generation, fittest bird) and
+        # draws the networks itself (draw_network), the trainer only logs, checkpoints and dumps the fittest network
+        self.max_generations = max_generations
+        self.simulation = simulation
+        self.file_prefix = file_prefix
+        self.logging_function = logging_function
+        self.inputs_name = inputs_name
+        self.outputs_name = outputs_name
+        self.dump_file = dump_file
+
+        self.config = Config(DefaultGenome, DefaultReproduction, DefaultSpeciesSet, DefaultStagnation, config_file)
+
+        # Columnar checkpoints every checkpoint_interval generations (None disables them), optionally resuming from one
+        self.checkpoint_interval = checkpoint_interval
+        self.load_checkpoint_number = load_checkpoint_number
+        self.checkpoint_directory = checkpoint_directory
+
+        # Every generation's genomes, parents and fitness appended to neat_archive (GenomeArchive)
+        self.archive = archive
+
+        # Same log as before: the fittest score and the logging function's message of every generation
+        makedirs(log_directory, exist_ok=True)
+        self.logger = logging.getLogger("neat_trainer")
+        self.logger.setLevel(logging.INFO)
+        handler = logging.FileHandler(join(
+            log_directory, "training_log_{}_{}.log".format(file_prefix, datetime.now().strftime("%Y_%m_%d-%H_%M"))
+        ))
+        handler.setFormatter(logging.Formatter("%(asctime)s-%(levelname)s> %(message)s", datefmt="%d-%b-%y %H:%M:%S"))
+        self.logger.addHandler(handler)
+
+        self.population = self.create_population()
+
+    def create_population(self):
+        if self.load_checkpoint_number is not None:
+            population = restore_checkpoint(
+                self.config, directory=self.checkpoint_directory, file_prefix=self.file_prefix,
+                generation=self.load_checkpoint_number
+            )
+        else:
+            population = Population(self.config)
+
+        population.add_reporter(StdOutReporter(True))
+        self.checkpointer = None
+        if self.checkpoint_interval is not None:
+            self.checkpointer = ColumnarCheckpointer(
+                directory=self.checkpoint_directory, file_prefix=self.file_prefix,
+                generation_interval=self.checkpoint_interval, ancestors=population.reproduction.ancestors
+            )
+            population.add_reporter(self.checkpointer)
+        if self.archive:
+            population.add_reporter(GenomeArchive(ancestors=population.reproduction.ancestors))
+        return population
+
+    def add_reporter(self, reporter):
+        self.population.add_reporter(reporter)
+
+    def evaluate(self, genomes, config):
+        generation, fittest = self.simulation(genomes, config)
+
+        message = "---END OF GENERATION {}---\nFittest Score: {}\n".format(generation, fittest.genome.fitness)
+        if self.logging_function is not None:
+            message += self.logging_function(fittest)
+        self.logger.info(message + "\n")
+
+    def run_simulation(self):
+        try:
+            winner = self.population.run(self.evaluate, self.max_generations)
+        finally:
+            self.close()
+
+        # The fittest network ever, replayable without neat-python (replay.py)
+        CompiledNetwork.create(winner, self.config).save(
+            self.dump_file, inputs_name=self.inputs_name, outputs_name=self.outputs_name
+        )
+        return winner
+
+    def close(self):
+        for handler in list(self.logger.handlers):
+            handler.close()
+            self.logger.removeHandler(handler)
+
+        # Waiting for the checkpoints still being written
+        if self.checkpointer is not None:
+            self.checkpointer.close()
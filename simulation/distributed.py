@@ -0,0 +1,183 @@
+# Networking
+from multiprocessing import TimeoutError, AuthenticationError
+from multiprocessing.connection import Listener, Client, wait
+
+# Game
+from .parallel import ParallelFlappyBirdAI, initialize_worker, evaluate_shard
+
+# Utils
+from collections import deque
+from os import environ
+from secrets import token_hex
+from threading import Thread, Lock
+from time import perf_counter, sleep
+
+
+# Workers and coordinator read the shared key from this variable when it is not given
+AUTHKEY_VARIABLE = "FLAPPY_BIRD_AUTHKEY"
+
+
+def get_authkey(authkey=None):
+    # Given key, then the environment's, otherwise None
+    authkey = authkey if authkey is not None else environ.get(AUTHKEY_VARIABLE)
+    if isinstance(authkey, str):
+        authkey = authkey.encode()
+    return authkey
+
+
+def run_worker(address, authkey, retry_seconds=30):
+    # Waiting for the coordinator to listen, workers may be started first
+    deadline = perf_counter() + retry_seconds
+    while True:
+        try:
+            connection = Client(address, authkey=authkey)
+            break
+        except ConnectionRefusedError:
+            if perf_counter() > deadline:
+                raise
+            sleep(0.5)
+
+    with connection:
+        # Same headless game as a local worker, then shards until the coordinator closes
+        number_pipes, game_options = connection.recv()
+        initialize_worker(number_pipes, game_options)
+        while True:
+            try:
+                job = connection.recv()
+            except EOFError:
+                return
+            if job is None:
+                return
+
+            # Errors are sent back and raised by the coordinator, as a pool would
+            try:
+                result = evaluate_shard(*job)
+            except Exception as error:
+                result = error
+            connection.send(result)
+
+
+class DistributedFlappyBirdAI(ParallelFlappyBirdAI):
+    def __init__(
+            self, number_pipes, num_workers, address=("localhost", 6000), authkey=None,
+            straggler_timeout=None, **options
+    ):
+        # Workers connect to address (run_worker), at any time; every generation is split into num_workers shards
+        # and a shard still running after straggler_timeout seconds is sent to an idle worker too
+        self.address = address
+        self.straggler_timeout = straggler_timeout
+
+        # Workers receive pickled data and run it, so only workers with the key are accepted: without one
+        # (neither given nor in FLAPPY_BIRD_AUTHKEY) a random key is generated and printed for the workers
+        self.authkey = get_authkey(authkey)
+        if self.authkey is None:
+            self.authkey = token_hex(16).encode()
+            print("Workers' authkey: {}".format(self.authkey.decode()))
+        super().__init__(number_pipes=number_pipes, num_workers=num_workers, **options)
+
+    def start_workers(self, game_options):
+        self.game_options = game_options
+        self.workers = []
+        self.new_workers = []
+        self.running = {}
+        self.workers_lock = Lock()
+        self.listener = Listener(self.address, authkey=self.authkey)
+        self.address = self.listener.address
+        self.accept_thread = Thread(target=self.accept_loop, daemon=True)
+        self.accept_thread.start()
+
+    def accept_loop(self):
+        while True:
+            try:
+                connection = self.listener.accept()
+                connection.send((self.number_pipes, self.game_options))
+            except (OSError, EOFError, AuthenticationError):
+                # Closed listener, or a worker that failed the handshake
+                if self.listener is None:
+                    return
+                continue
+
+            with self.workers_lock:
+                self.new_workers.append(connection)
+
+    def remove_worker(self, connection):
+        self.workers.remove(connection)
+        self.running.pop(connection, None)
+        connection.close()
+
+    def evaluate_shards(self, jobs):
+        # Every worker runs one shard at a time: running maps it to (generation, shard, start time). Workers
+        # still busy with a straggler's copy of an older generation rejoin once done, their result is dropped
+        results = [None] * len(jobs)
+        pending = deque(range(len(jobs)))
+        redispatched = set()
+        running = self.running
+        start = perf_counter()
+
+        while any(result is None for result in results):
+            with self.workers_lock:
+                self.workers.extend(self.new_workers)
+                self.new_workers.clear()
+
+            # Stragglers are queued again once, the first copy to finish wins
+            now = perf_counter()
+            if self.straggler_timeout is not None:
+                for generation, shard, started in list(running.values()):
+                    straggling = generation == self.generation and now - started > self.straggler_timeout
+                    if straggling and shard not in redispatched and results[shard] is None:
+                        redispatched.add(shard)
+                        pending.append(shard)
+
+            # Sending a shard to every idle worker
+            for connection in [worker for worker in self.workers if worker not in running]:
+                while pending and results[pending[0]] is not None:
+                    pending.popleft()
+                if not pending:
+                    break
+
+                shard = pending.popleft()
+                try:
+                    connection.send(jobs[shard])
+                    running[connection] = (self.generation, shard, now)
+                except OSError:
+                    self.remove_worker(connection)
+                    pending.appendleft(shard)
+
+            # Collecting results, a lost worker's shard goes back to the queue
+            for connection in wait(list(running), timeout=0.1):
+                generation, shard, _ = running.pop(connection)
+                try:
+                    result = connection.recv()
+                except (EOFError, OSError):
+                    self.remove_worker(connection)
+                    if generation == self.generation and results[shard] is None:
+                        pending.appendleft(shard)
+                    continue
+
+                if generation != self.generation:
+                    continue
+                if isinstance(result, Exception):
+                    raise result
+                if results[shard] is None:
+                    results[shard] = result
+
+            if self.timeout is not None and perf_counter() - start > self.timeout:
+                raise TimeoutError("Generation {} timed out".format(self.generation))
+
+        return results
+
+    def close(self):
+        if getattr(self, "listener", None) is not None:
+            listener, self.listener = self.listener, None
+            listener.close()
+            with self.workers_lock:
+                self.workers.extend(self.new_workers)
+                self.new_workers.clear()
+            for connection in self.workers:
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass
+                connection.close()
+            self.workers = []
+        super().close()
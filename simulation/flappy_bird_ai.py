@@ -1,56 +1,140 @@
-# Pygame stuff
+# Utils
 import numpy as np
-from pygame.display import set_mode, update
-from pygame.event import get
-from pygame import QUIT, quit
 
 # Models
-from .models.floor import GameFloor
 from .models.bird_agent import BirdAgent
 from .models.track import PipeTrack
+from .models.population import BirdPopulation
+from .models.sensors import BirdSensors
+from .models.curriculum import TrackCurriculum
+
+# Rendering (the renderer itself, and pygame with it, is only imported by games with a window)
+from .snapshot import GameSnapshot
 
 # Utils
-from .utils.constants import GameImages
+from .utils.constants import Termination
+from .utils.profiler import PhaseProfiler
+from .utils.telemetry import TelemetryWriter, summarize_generation
+from .utils.recording import FlapRecorder, get_recording_path
+from .utils.clock import SimulationClock
+from random import Random
+from time import perf_counter
 
-# AI
-from neat.nn import FeedForwardNetwork
+# AI (neat-python is only imported to compile genomes, replays run on NumPy alone)
+from .ai.compiled_network import CompiledNetwork, BatchedNetworks
+from .ai.network_drawer import NetworkDrawer
 
 
 class FlappyBirdAI:
-    def __init__(self, number_pipes):
+    def __init__(
+            self,
+            number_pipes, headless=False, seed=None, number_tracks=None,
+            batched_inference=True, collision_mode="pixel",
+            max_ticks=None, stop_at_fitness_threshold=False, stagnation_ticks=None,
+            render_every=1, target_fps=None, render_thread=False,
+            profile=False, evaluation_tracks=1, track_aggregation="mean", telemetry=False,
+            draw_network=False, input_normalization=None, record=False,
+            ticks_per_second=None, decision_interval=1, curriculum=False
+    ):
         # Initializing constants
         self.window_dimensions = np.array([500, 800])
         self.floor_height = 700
 
         # Initializing simulation variables
         self.generation = 0
+        self.headless = headless
+
+        # Tracks: a new one every generation or a fixed set of tracks rotated across generations. Seeds are drawn
+        # from the game's own generator, NEAT's (the random module) is left untouched
+        self.random = Random()
+        self.seed = self.random.randrange(2 ** 32) if seed is None and number_tracks is not None else seed
+        self.number_tracks = number_tracks
+        self.track_layouts = {}
+
+        # Compiled networks of the last generation, indexed by genome key
+        self.batched_inference = batched_inference
+        self.network_cache = {}
+
+        # Every genome plays evaluation_tracks tracks, its fitness aggregates them (mean, min or a quantile)
+        self.evaluation_tracks = evaluation_tracks
+        self.track_aggregation = track_aggregation
+        self.evaluation_layouts = {}
+
+        # Pixel perfect collisions or cheaper analytic ones
+        self.collision_mode = collision_mode
+
+        # Termination policies: a budget of ticks, stopping once the fittest bird reaches the config's
+        # fitness threshold and stopping once no bird has passed a new pipe for a number of ticks (the
+        # birds stopped making progress, surviving longer only adds the same small score to all of them)
+        self.max_ticks = max_ticks
+        self.stop_at_fitness_threshold = stop_at_fitness_threshold
+        self.stagnation_ticks = stagnation_ticks
+
+        # Per phase timings of every generation, written next to the training logs
+        self.profiler = PhaseProfiler() if profile else None
 
-        # Initializing Floor and Background
-        self.GAME_FLOOR = GameFloor(height=self.floor_height)
-        self.background_position = np.array([0, -150])
+        # Statistics of every generation streamed to neat_logs/telemetry_*.jsonl
+        self.telemetry = TelemetryWriter() if telemetry else None
+        self.last_pipes_passed = None
 
-        # Setting up Game
-        self.GAME_WINDOW = set_mode(self.window_dimensions)
+        # Every bird's flaps are recorded and saved to neat_recordings, to play any generation again
+        self.record = record
+        self.recording_directory = "neat_recordings" if record else None
+        self.last_recording = None
+
+        # The fittest network is drawn to svg_growth by a background thread, whenever its topology changes
+        self.network_drawer = NetworkDrawer() if draw_network else None
+
+        # Fixed step physics: windowed games are paced to ticks_per_second (as fast as possible without it),
+        # headless ones never wait. Birds think every decision_interval ticks and do not flap in between
+        self.clock = SimulationClock(ticks_per_second=ticks_per_second, decision_interval=decision_interval)
+
+        # Setting up Game: a headless game never opens a window, otherwise a spectator renderer draws
+        # a snapshot every render_every ticks (and no faster than target_fps), optionally on its own thread
+        self.renderer = None
+        if not headless:
+            from .renderer import GameRenderer
+            self.renderer = GameRenderer(
+                window_dimensions=self.window_dimensions,
+                floor_height=self.floor_height,
+                render_every=render_every,
+                target_fps=target_fps,
+                threaded=render_thread
+            )
 
         # Initializing Bird constants
         self.bird_starting_position = np.array([
             self.window_dimensions[0] // 4,
             3 * self.window_dimensions[1] // 8
         ])
+        self.bird_diameter = 0
 
         # Initializing Pipe constants
         self.pipe_width = 50
         self.pipe_distance = self.pipe_width * 3.5
         self.pipe_velocity = np.array([2, 0])
         self.number_pipes = number_pipes
+        self.pipes_gap = 5 * self.floor_height // 16
+        self.gap_heights = PipeTrack.GAP_HEIGHTS
+
+        # Curriculum: short tracks with wide gaps at first, longer and harder ones every time the fittest bird
+        # completes a track, the full tracks are only played once the birds can use them
+        self.curriculum = TrackCurriculum(number_pipes=number_pipes) if curriculum else None
+
+        # Networks' inputs as the game measures them, or mapped to [-1, 1] ("tanh" uses the game's own
+        # ranges, otherwise a (low, high) range per input)
+        self.sensors = BirdSensors(
+            bird_diameter=self.bird_diameter,
+            input_ranges=self.get_input_ranges() if input_normalization == "tanh" else input_normalization
+        )
 
     # Initializing Birds
     def _create_agent(self, bird_id, genome, neural_network, closest_pipe):
         return BirdAgent(
             bird_id=bird_id,
             starting_position=self.bird_starting_position,
-            bird_diameter=0,
-            max_height=self.floor_height - BirdAgent.ANIMATION[0].get_height(),
+            bird_diameter=self.bird_diameter,
+            max_height=self.floor_height - BirdAgent.SIZE[1],
             total_pipes=self.number_pipes,
             closest_pipe=closest_pipe,
             genome=genome,
@@ -58,74 +142,164 @@ class FlappyBirdAI:
         )
 
     # Game itself
-    def run(self, game_track, birds_population):
-        # Create a copy
-        this_generation = birds_population.copy()
+    def run(self, game_track, population, fitness_threshold=None, recorder=None):
+        ticks = 0
+        last_progress = 0
+        best_pipes_passed = 0
+        lap = self.profiler.lap if self.profiler is not None else None
+        self.clock.restart()
         while True:
-            # Dispatch events before proceeding
-            for event in get():
-                if event.type == QUIT:
-                    quit()
-                    return
-
-            # First: Drawing Background first
-            self.GAME_WINDOW.blit(GameImages.BACKGROUND, self.background_position)
-
-            # Second: Updating and drawing pipes
-            passed_pipe = game_track.draw(game_window=self.GAME_WINDOW)
-
-            # Third: Drawing Floor
-            self.GAME_FLOOR.draw(game_window=self.GAME_WINDOW)
-
-            # Fourth: Perform Bird Action, increase score and Draw
-            game_overs = 0
-            for bird in birds_population:
-                bird.think_and_do_something()
-                bird.increase_pipe_score(passed_pipe=passed_pipe,
-                                         closest_pipe=game_track.pipes_queue[0] if len(
-                                             game_track.pipes_queue) > 0 else None)
-                bird.draw_pygame(game_window=self.GAME_WINDOW)
-                game_overs += 0 if bird.game_over else 1
-
-            birds_population = np.array(
-                list(filter(lambda bird: not bird.game_over, birds_population))
-            )
+            # First: Updating pipes
+            passed_pipe = game_track.update()
+            if lap:
+                lap("pipe_update")
 
-            # Fifth: Update canvas
-            update()
+            # Second: Perform every Bird's Action in a single batched step and increase score
+            flaps = population.think() if self.clock.should_decide(ticks) else population.no_flaps
+            if recorder is not None:
+                recorder.record(flaps)
+            if lap:
+                lap("think")
+            population.update(flaps=flaps, lap=lap)
+            population.increase_pipe_score(passed_pipe=passed_pipe, closest_pipe=game_track.closest_pipe())
+            ticks += 1
+            if lap:
+                lap("score")
 
-            # Sixth: Determine if all birds game over
-            if game_overs == 0:
-                break
+            # Third: Drawing a snapshot of the game, if the spectator is due a frame
+            if self.renderer is not None:
+                if self.renderer.should_render(ticks):
+                    self.renderer.submit(GameSnapshot.capture(tick=ticks, game_track=game_track, population=population))
+                if lap:
+                    lap("render")
+                self.clock.wait(ticks)
+                if lap:
+                    lap("wait")
+                if self.renderer.closed:
+                    # The spectator left, the game goes on headless (this generation and the next ones)
+                    self.renderer.close()
+                    self.renderer = None
+                    self.headless = True
 
-    # Setting up simulation
-    def simulation(self, genomes, config):
-        # Update simulation variables
-        self.generation += 1
+            # Fourth: Determine if all birds game over or if a termination policy stops the generation
+            if self.stagnation_ticks is not None and passed_pipe:
+                pipes_passed = population.pipes_passed.max()
+                if pipes_passed > best_pipes_passed:
+                    best_pipes_passed, last_progress = pipes_passed, ticks
+
+            if population.count_alive() == 0:
+                return Termination.GAME_OVER, ticks
+            if self.max_ticks is not None and ticks >= self.max_ticks:
+                return Termination.MAX_TICKS, ticks
+            if fitness_threshold is not None and population.get_fitness().max() >= fitness_threshold:
+                return Termination.FITNESS_THRESHOLD, ticks
+            if self.stagnation_ticks is not None and ticks - last_progress >= self.stagnation_ticks:
+                return Termination.STAGNATION, ticks
+
+    def get_track_seed(self):
+        # Seed of the current generation's track (None means a random track)
+        return PipeTrack.get_seed(seed=self.seed, generation=self.generation, number_tracks=self.number_tracks)
+
+    def get_track_layout(self, seed):
+        # Rotated tracks are generated only once
+        if self.number_tracks is None or seed is None:
+            return None
+
+        if seed not in self.track_layouts:
+            self.track_layouts[seed] = self.generate_layout(seed)
+        return self.track_layouts[seed]
+
+    def generate_layout(self, seed):
+        return PipeTrack.generate_layout(
+            seed=seed,
+            number_pipes=self.number_pipes,
+            height=self.floor_height,
+            pipes_gap=self.pipes_gap,
+            gap_heights=self.gap_heights
+        )
+
+    def get_evaluation_layouts(self, track):
+        # Pipes' Y of every track a genome plays, the generation's track first and the others seeded from it
+        if self.evaluation_tracks == 1:
+            return None
+        if track.seed in self.evaluation_layouts:
+            return self.evaluation_layouts[track.seed]
+
+        layouts = np.empty((self.evaluation_tracks, self.number_pipes, 2))
+        layouts[0] = track.pipes_track
+        for track_number in range(1, self.evaluation_tracks):
+            layouts[track_number] = self.generate_layout(None if track.seed is None else (track.seed, track_number))
 
-        # Create track
-        track = PipeTrack(
+        # Shared by every bird, and kept for the next generations when a fixed set of tracks is rotated
+        layouts.flags.writeable = False
+        if self.number_tracks is not None and track.seed is not None:
+            self.evaluation_layouts[track.seed] = layouts
+        return layouts
+
+    def get_input_ranges(self):
+        # Any track has the same geometry, only its pipes' heights are random
+        return self.create_track(track_seed=None).get_input_ranges(
+            bird_diameter=self.bird_diameter, max_height=self.floor_height - BirdAgent.SIZE[1]
+        )
+
+    def create_track(self, track_seed, layout=None):
+        return PipeTrack(
             pipe_distance=self.pipe_distance,
             pipe_velocity=self.pipe_velocity,
             number_pipes=self.number_pipes,
             game_dimensions=np.array([self.window_dimensions[0], self.floor_height]),
             bird_x=self.bird_starting_position[0],
-            bird_width=BirdAgent.ANIMATION[0].get_width()
+            bird_width=BirdAgent.SIZE[0],
+            seed=track_seed,
+            layout=self.get_track_layout(track_seed) if layout is None else layout,
+            pipes_gap=self.pipes_gap,
+            gap_heights=self.gap_heights
         )
 
+    def set_track_parameters(self, number_pipes, pipes_gap, gap_heights):
+        # Generated tracks are only valid for the parameters they were generated with
+        if (number_pipes, pipes_gap, gap_heights) != (self.number_pipes, self.pipes_gap, self.gap_heights):
+            self.number_pipes, self.pipes_gap, self.gap_heights = number_pipes, pipes_gap, gap_heights
+            self.track_layouts.clear()
+            self.evaluation_layouts.clear()
+
+    # Setting up simulation
+    def simulation(self, genomes, config, track_seed=None):
+        # Update simulation variables
+        self.generation += 1
+        generation_start = perf_counter()
+        if self.profiler is not None:
+            self.profiler.start_generation()
+
+        # Create track, as hard as the curriculum allows
+        if self.curriculum is not None:
+            self.set_track_parameters(
+                *self.curriculum.get_track_parameters(height=self.floor_height)
+            )
+        track_seed = self.get_track_seed() if track_seed is None else track_seed
+        track = self.create_track(track_seed)
+
         # Create population
         new_generation = []
+        network_cache = {}
         for genome_id, genome in genomes:
             # Setting fitness to 0
             genome.fitness = 0
 
-            # Creating bird
-            brain = FeedForwardNetwork.create(genome, config)
+            # Creating bird (genomes that survived the last generation are not compiled again)
+            if self.batched_inference:
+                brain = self.network_cache.get(genome_id)
+                if brain is None:
+                    brain = CompiledNetwork.create(genome, config)
+                network_cache[genome_id] = brain
+            else:
+                from neat.nn import FeedForwardNetwork
+                brain = FeedForwardNetwork.create(genome, config)
             bird = self._create_agent(
                 bird_id=genome_id,
                 genome=genome,
                 neural_network=brain,
-                closest_pipe=track.pipes_queue[0]
+                closest_pipe=track.closest_pipe()
             )
 
             # Appending bird to generation
@@ -138,16 +312,158 @@ class FlappyBirdAI:
         )
 
         # Run the simulation
-        self.run(
+        population = BirdPopulation(
+            agents=birds,
+            starting_position=self.bird_starting_position,
+            max_height=self.floor_height - BirdAgent.SIZE[1],
+            total_pipes=self.number_pipes,
+            closest_pipe=track.closest_pipe(),
+            networks=BatchedNetworks([bird.brain for bird in birds]) if self.batched_inference else None,
+            collision_mode=self.collision_mode,
+            layouts=self.get_evaluation_layouts(track),
+            aggregation=self.track_aggregation,
+            sensors=self.sensors
+        )
+        self.network_cache = network_cache
+        if self.profiler is not None:
+            self.profiler.lap("setup")
+        recorder = FlapRecorder() if self.record else None
+        termination, ticks = self.run(
             game_track=track,
-            birds_population=birds
+            population=population,
+            fitness_threshold=config.fitness_threshold if self.stop_at_fitness_threshold else None,
+            recorder=recorder
         )
 
+        # Keeping the generation's flaps, in the population's order
+        if recorder is not None:
+            self.last_recording = recorder.finish(
+                generation=self.generation,
+                track_seed=track_seed,
+                layouts=population.layouts if population.layouts is not None else track.pipes_track[np.newaxis],
+                bird_ids=np.array([bird.bird_id for bird in birds]),
+                collision_mode=self.collision_mode,
+                termination=termination
+            )
+            if self.recording_directory is not None:
+                self.last_recording.save(get_recording_path(self.generation, directory=self.recording_directory))
+
+        # Pushing the final fitness back to the genomes
+        population.push_results()
+        self.last_pipes_passed = population.aggregate(population.pipes_passed)
+        if self.curriculum is not None:
+            self.curriculum.update(best_pipes_passed=self.last_pipes_passed.max(), total_pipes=self.number_pipes)
+
         # Sort all the birds based on their genome
         birds = np.array(
             sorted(list(birds)),
             dtype=BirdAgent
         )
 
+        # Reporting why the generation ended
+        birds[0].termination = termination
+        birds[0].ticks = ticks
+
+        if self.network_drawer is not None:
+            self.network_drawer.submit(birds[0].genome, config)
+
+        # Reporting where the generation's time went
+        if self.profiler is not None:
+            self.profiler.lap("setup")
+            record = self.profiler.end_generation(
+                generation=self.generation, ticks=ticks, birds=len(birds), bird_ticks=population.bird_ticks
+            )
+            birds[0].profile = PhaseProfiler.summary(record)
+
+        # Streaming the generation's statistics
+        if self.telemetry is not None:
+            self.telemetry.write(summarize_generation(
+                generation=self.generation,
+                fitness=population.get_fitness(),
+                pipes_passed=self.last_pipes_passed,
+                total_pipes=self.number_pipes,
+                ticks=ticks,
+                termination=termination,
+                seconds=perf_counter() - generation_start,
+                phases=record["phases"] if self.profiler is not None else None
+            ))
+
         # Return current generation and fittest
         return self.generation, birds[0]
+
+    # Shutting down: the telemetry and the drawing still queued are written, the window is closed
+    def close(self):
+        if self.telemetry is not None:
+            self.telemetry.close()
+        if self.network_drawer is not None:
+            self.network_drawer.close()
+        if self.renderer is not None:
+            self.renderer.close()
+
+    # Replaying a trained network on a track, without genomes
+    def replay(self, network, track_seed=None):
+        track = self.create_track(track_seed)
+        bird = self._create_agent(bird_id=0, genome=None, neural_network=network, closest_pipe=track.closest_pipe())
+        population = BirdPopulation(
+            agents=[bird],
+            starting_position=self.bird_starting_position,
+            max_height=self.floor_height - BirdAgent.SIZE[1],
+            total_pipes=self.number_pipes,
+            closest_pipe=track.closest_pipe(),
+            networks=BatchedNetworks([network]) if self.batched_inference else None,
+            collision_mode=self.collision_mode,
+            sensors=self.sensors
+        )
+        bird.termination, bird.ticks = self.run(game_track=track, population=population)
+        population.push_results()
+
+        # Same fitness the bird would get while training
+        return bird, float(population.fitness[0])
+
+    # Playing a recorded generation again, the flaps are read from the recording instead of the networks
+    def play_recording(self, recording, start_tick=0, ticks_per_second=None):
+        if recording.layouts.shape[1] != self.number_pipes:
+            raise ValueError("The recording has {} pipes, the game {}".format(recording.layouts.shape[1], self.number_pipes))
+
+        track = self.create_track(recording.track_seed, layout=recording.layouts[0])
+        birds = [
+            self._create_agent(bird_id=bird_id, genome=None, neural_network=None, closest_pipe=track.closest_pipe())
+            for bird_id in recording.bird_ids.tolist()
+        ]
+        population = BirdPopulation(
+            agents=birds,
+            starting_position=self.bird_starting_position,
+            max_height=self.floor_height - BirdAgent.SIZE[1],
+            total_pipes=self.number_pipes,
+            closest_pipe=track.closest_pipe(),
+            collision_mode=recording.collision_mode,
+            layouts=recording.layouts if len(recording.layouts) > 1 else None,
+            aggregation=self.track_aggregation
+        )
+
+        # Ticks before start_tick are simulated without drawing nor waiting (seeking), the others
+        # are drawn at ticks_per_second (the game's own pace by default)
+        ticks = 0
+        clock = self.clock if ticks_per_second is None else SimulationClock(ticks_per_second=ticks_per_second)
+        while ticks < recording.ticks and population.count_alive() > 0:
+            passed_pipe = track.update()
+            population.update(flaps=recording.get_flaps(ticks))
+            population.increase_pipe_score(passed_pipe=passed_pipe, closest_pipe=track.closest_pipe())
+            ticks += 1
+
+            if self.renderer is None or ticks < start_tick:
+                continue
+            if ticks == max(start_tick, 1):
+                clock.restart(ticks)
+            clock.wait(ticks)
+            if self.renderer.should_render(ticks):
+                self.renderer.submit(GameSnapshot.capture(tick=ticks, game_track=track, population=population))
+            if self.renderer.closed:
+                # Nothing left to watch, the game is headless from now on
+                self.renderer.close()
+                self.renderer = None
+                self.headless = True
+                return Termination.WINDOW_CLOSED, ticks, population.get_fitness()
+
+        # Same fitness every genome got while training
+        return Termination[recording.termination], ticks, population.get_fitness()
@@ -3,16 +3,25 @@ import numpy as np
 
 
 def get_closest_pipe(track):
-    # If there are more than 1 one pipe, just return pipe 0
-    if len(track.pipes_queue) > 0:
-        return track.pipes_queue[0]
-    else:
-        # If the track has been completed, return Null
-        return None
+    # Pipe 0 of the track's queue, or Null if the track has been completed
+    return track.closest_pipe()
 
 
 class Bird:
     GRAVITY = np.array([0, 0.25])
+    FLAP_VELOCITY = np.array([0, -8])
+
+    # Velocity of a bird at rest, shared by every bird (the vectors are replaced, never modified in place)
+    REST_VELOCITY = np.zeros(2)
+    REST_VELOCITY.flags.writeable = False
+
+    # No per-instance dictionary, populations hold thousands of birds
+    __slots__ = (
+        "starting_position", "position", "max_height",
+        "velocity", "flap_velocity",
+        "bird_diameter", "bird_radius", "closest_pipe",
+        "game_over", "distance", "pipes_passed", "total_pipes"
+    )
 
     def __init__(
             self,
@@ -29,10 +38,9 @@ class Bird:
         self.max_height = max_height
 
         # Velocity Vectors
-        self.velocity = np.empty(2)
-        self.velocity.fill(0)
+        self.velocity = Bird.REST_VELOCITY
 
-        self.flap_velocity = np.array([0, -8])
+        self.flap_velocity = Bird.FLAP_VELOCITY
 
         # Bird constants
         self.bird_diameter = bird_diameter
@@ -51,27 +59,43 @@ class Bird:
     def flap(self):
         self.velocity = self.flap_velocity
 
+    @staticmethod
+    def collides(center_x, center_y, half_width, half_height, pipe_x, pipe_width, gap_top, gap_bottom):
+        # Growing the pipes by the bird's half extents and checking the bird's center against them,
+        # works with scalars or with arrays of birds
+        inside_pipe = (pipe_x - half_width <= center_x) & (center_x <= pipe_x + pipe_width + half_width)
+        outside_gap = (gap_top + half_height >= center_y) | (gap_bottom - half_height <= center_y)
+        return inside_pipe & outside_gap
+
+    @staticmethod
+    def collides_circle(center_x, center_y, radius, pipe_x, pipe_width, gap_top, gap_bottom):
+        # Closest point of each pipe to the bird's center (the center clamped to the pipe) within the radius,
+        # works with scalars or with arrays of birds
+        distance_x = center_x - np.clip(center_x, pipe_x, pipe_x + pipe_width)
+        distance_top = center_y - np.minimum(center_y, gap_top)
+        distance_bottom = center_y - np.maximum(center_y, gap_bottom)
+        return (
+            (distance_x ** 2 + distance_top ** 2 <= radius ** 2) |
+            (distance_x ** 2 + distance_bottom ** 2 <= radius ** 2)
+        )
+
     def check_collision(self):
-        # Get points
-        points = np.array([
-            # X points
-            [self.closest_pipe.top_pipe.position[0] - self.bird_radius,
-             self.closest_pipe.top_pipe.position[0] + self.closest_pipe.top_pipe.width + self.bird_radius],
-            # Top Pipe Y Height
-            [self.closest_pipe.top_pipe.position[1] + self.closest_pipe.top_pipe.height + self.bird_radius],
-            # Bottom Pipe Y Height
-            [self.closest_pipe.bottom_pipe.position[1] - self.bird_radius],
-        ])
-
-        # Check collision Top Pipe
-        if points[0][0] <= self.position[0] <= points[0][1]:
-            if points[1] >= self.position[1] or points[2] <= self.position[1]:
-                self.game_over = True
+        # Check collision with both pipes, grown by the bird's radius on every side
+        if Bird.collides(
+                center_x=self.position[0],
+                center_y=self.position[1],
+                half_width=self.bird_radius,
+                half_height=self.bird_radius,
+                pipe_x=self.closest_pipe.top_pipe.position[0],
+                pipe_width=self.closest_pipe.top_pipe.width,
+                gap_top=self.closest_pipe.top_pipe.position[1] + self.closest_pipe.top_pipe.height,
+                gap_bottom=self.closest_pipe.bottom_pipe.position[1]
+        ):
+            self.game_over = True
 
     def increase_pipe_score(self, passed_pipe, closest_pipe):
         if passed_pipe and not self.game_over:
             self.pipes_passed += 1
-            print("Distance: {}\nPipe Score: {}".format(self.distance, self.pipes_passed))
             self.closest_pipe = closest_pipe
             self.game_over = self.pipes_passed == self.total_pipes
 
@@ -102,8 +126,7 @@ class Bird:
     def reset(self, closest_pipe):
         # Resetting vectors
         self.position = self.starting_position
-        self.velocity = np.empty(2)
-        self.velocity.fill(0)
+        self.velocity = Bird.REST_VELOCITY
 
         # Resetting score variables
         self.distance = 0
@@ -1,20 +1,30 @@
-# Pygame Stuff
-from pygame.mask import from_surface
-
 # Models
 from .bird import Bird
 from .pipe import DualPipe
+from .sensors import BirdSensors
 
 # utils
-from ..utils.constants import GameImages
+from ..utils.constants import GameImages, SpriteSizes, LazyClassAttribute
 import numpy as np
 from math import ceil
 
 
 class BirdAgent(Bird):
-    ANIMATION = GameImages.BIRD_ANIMATION
+    SIZE = SpriteSizes.BIRD
     ANIMATION_TIME = 5
 
+    @LazyClassAttribute
+    def ANIMATION():
+        return GameImages.BIRD_ANIMATION
+
+    # Collision masks of every animation frame (physics always use the first one)
+    @LazyClassAttribute
+    def MASKS():
+        from pygame.mask import from_surface
+        return [from_surface(frame) for frame in BirdAgent.ANIMATION]
+
+    __slots__ = ("bird_id", "animation_counter", "termination", "ticks", "profile", "genome", "brain")
+
     def __init__(
             self,
             # Game variables
@@ -46,6 +56,13 @@ class BirdAgent(Bird):
         # Initializing game variables
         self.animation_counter = 0
 
+        # Why and after how many ticks the bird's generation ended
+        self.termination = None
+        self.ticks = 0
+
+        # Summary of the generation's timings, if it was profiled
+        self.profile = None
+
         # Initializing simulation variables
         self.genome = genome
         self.brain = neural_network
@@ -60,23 +77,37 @@ class BirdAgent(Bird):
     def log_stats(agent):
         message = "Pipes Passed: {}\n".format(agent.pipes_passed)
         message += "Percentage Completed: {:.2f}%\n".format(100 * agent.pipes_passed / agent.total_pipes)
+        if agent.termination is not None:
+            message += "Termination: {} after {} ticks\n".format(agent.termination.value, agent.ticks)
+        if agent.profile is not None:
+            message += "Profile: {}\n".format(agent.profile)
         return message
 
-    def think(self):
-        # Extract inputs
-        inputs = (
-            # First input: Bird's Y position
-            self.position[1],
-            # Second input: X position of the farthest corner
-            self.closest_pipe.top_pipe.position[0] + self.closest_pipe.top_pipe.width + self.bird_diameter / 2,
-            # Third input: Top pipe's height,
-            self.closest_pipe.top_pipe.position[1] + self.closest_pipe.top_pipe.height + self.bird_diameter / 2,
-            # Fourth input: Bottom pipe's height
-            self.closest_pipe.bottom_pipe.position[1] - self.bird_diameter / 2
+    @staticmethod
+    def get_animation_frame(animation_counter):
+        if animation_counter <= 5:
+            return BirdAgent.ANIMATION[0]
+        elif animation_counter <= 10:
+            return BirdAgent.ANIMATION[1]
+        elif animation_counter <= 15:
+            return BirdAgent.ANIMATION[2]
+        else:
+            return BirdAgent.ANIMATION[1]
+
+    def think(self, sensors=None):
+        # Extract inputs, same pipeline as the whole population's:
+        # Bird's Y position, X position of the farthest corner, Top pipe's height and Bottom pipe's height
+        sensors = sensors if sensors is not None else BirdSensors(bird_diameter=self.bird_diameter)
+        top_pipe_height, bottom_pipe_height = sensors.get_gap_features(self.closest_pipe)
+        inputs = sensors.get_inputs(
+            birds_y=[self.position[1]],
+            farthest_corner=sensors.get_corner_feature(self.closest_pipe),
+            top_pipe_height=top_pipe_height,
+            bottom_pipe_height=bottom_pipe_height
         )
 
         # Forward pass of the neural network
-        output = self.brain.activate(inputs)
+        output = self.brain.activate(inputs[0].tolist())
 
         # Think and return the action
         if output[0] > 0.5:
@@ -98,9 +129,9 @@ class BirdAgent(Bird):
     # Overriding some functions to adapt Processing to Pygame + NEAT Algorithm
     def check_collision_pygame(self):
         # Masks
-        bird_mask = from_surface(BirdAgent.ANIMATION[0])
-        top_pipe_mask = from_surface(DualPipe.TOP_PIPE)
-        bottom_pipe_mask = from_surface(DualPipe.BOTTOM_PIPE)
+        bird_mask = BirdAgent.MASKS[0]
+        top_pipe_mask = DualPipe.TOP_PIPE_MASK
+        bottom_pipe_mask = DualPipe.BOTTOM_PIPE_MASK
 
         # Calculating offsets
         top_pipe_offset = np.subtract(self.closest_pipe.top_pipe.position, self.position)
@@ -155,15 +186,7 @@ class BirdAgent(Bird):
         if not self.game_over:
             # Looping between the animations
             self.animation_counter = (self.animation_counter + 1) % 20
-
-            if self.animation_counter <= 5:
-                img_to_show = BirdAgent.ANIMATION[0]
-            elif self.animation_counter <= 10:
-                img_to_show = BirdAgent.ANIMATION[1]
-            elif self.animation_counter <= 15:
-                img_to_show = BirdAgent.ANIMATION[2]
-            else:
-                img_to_show = BirdAgent.ANIMATION[1]
+            img_to_show = BirdAgent.get_animation_frame(self.animation_counter)
 
             # Draw bird
             game_window.blit(img_to_show, self.position)
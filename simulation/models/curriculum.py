@@ -0,0 +1,44 @@
+# Models
+from .track import PipeTrack
+
+
+class TrackCurriculum:
+    # Easiest tracks: a gap of 5.5/16 of the game's height instead of 5/16, with pipes closer to the middle
+    EASIEST_GAP = 5.5 / 16
+    HARDEST_GAP = 5 / 16
+    EASIEST_GAP_HEIGHTS = (0.10, 0.55)
+
+    def __init__(self, number_pipes, min_pipes=5):
+        self.number_pipes = number_pipes
+        self.min_pipes = min(min_pipes, number_pipes)
+        self.level = 0
+
+    def get_number_pipes(self):
+        # The track doubles its length at every level, up to the full track
+        return min(self.number_pipes, self.min_pipes * 2 ** self.level)
+
+    def update(self, best_pipes_passed, total_pipes):
+        # The next level once the fittest bird of a generation completes the current track
+        if best_pipes_passed >= total_pipes and self.get_number_pipes() < self.number_pipes:
+            self.level += 1
+
+    def get_difficulty(self):
+        # From 0 on the shortest track to 1 on the full one
+        if self.number_pipes == self.min_pipes:
+            return 1.0
+        return (self.get_number_pipes() - self.min_pipes) / (self.number_pipes - self.min_pipes)
+
+    def get_track_parameters(self, height):
+        # Number of pipes, gap between the pipes and range of the top pipes' bottom edge
+        difficulty = self.get_difficulty()
+        if difficulty >= 1:
+            return self.number_pipes, 5 * height // 16, PipeTrack.GAP_HEIGHTS
+
+        # The gaps narrow as the tracks get longer
+        number_pipes = self.get_number_pipes()
+        gap = TrackCurriculum.EASIEST_GAP + (TrackCurriculum.HARDEST_GAP - TrackCurriculum.EASIEST_GAP) * difficulty
+        gap_heights = tuple(
+            easiest + (hardest - easiest) * difficulty
+            for easiest, hardest in zip(TrackCurriculum.EASIEST_GAP_HEIGHTS, PipeTrack.GAP_HEIGHTS)
+        )
+        return number_pipes, int(height * gap), gap_heights
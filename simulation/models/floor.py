@@ -1,31 +1,30 @@
 # Utils
 import numpy as np
-from ..utils.constants import GameImages
+from ..utils.constants import GameImages, SpriteSizes, LazyClassAttribute
 
 
 class GameFloor:
     FLOOR_VELOCITY = np.array([5, 0])
-    IMAGE = GameImages.FLOOR
-    WIDTH = GameImages.FLOOR.get_width()
+    WIDTH = SpriteSizes.FLOOR[0]
+
+    @LazyClassAttribute
+    def IMAGE():
+        return GameImages.FLOOR
 
     def __init__(self, height):
         # Initializing the position of 2 background tiles to make the illusion of ground moving
         self.position_floor_tile1 = np.array([0, height])
         self.position_floor_tile2 = np.array([GameFloor.WIDTH, height])
 
-    def draw(self, game_window):
-        # Moving both tiles
-        self.position_floor_tile1 = np.subtract(self.position_floor_tile1, GameFloor.FLOOR_VELOCITY)
-        self.position_floor_tile2 = np.subtract(self.position_floor_tile2, GameFloor.FLOOR_VELOCITY)
-
-        # Check if Tile 1 needs to be moved to the right
-        if self.position_floor_tile1[0] + GameFloor.WIDTH < 0:
-            self.position_floor_tile1[0] = self.position_floor_tile2[0] + GameFloor.WIDTH
+    def update(self, ticks=1):
+        # Moving both tiles, as many ticks as the ones elapsed since the last frame
+        offset = (GameFloor.WIDTH - self.position_floor_tile1[0] + ticks * GameFloor.FLOOR_VELOCITY[0]) % GameFloor.WIDTH
 
-        # Check if Tile 1 needs to be moved to the right
-        if self.position_floor_tile2[0] + GameFloor.WIDTH < 0:
-            self.position_floor_tile2[0] = self.position_floor_tile1[0] + GameFloor.WIDTH
+        # Tile 1 is always the one on the left, Tile 2 follows it
+        self.position_floor_tile1[0] = -offset
+        self.position_floor_tile2[0] = GameFloor.WIDTH - offset
 
+    def draw(self, game_window):
         # Drawing background
         game_window.blit(GameFloor.IMAGE, self.position_floor_tile1)
         game_window.blit(GameFloor.IMAGE, self.position_floor_tile2)
@@ -1,16 +1,16 @@
-# Pygame
-from pygame.transform import flip
-
 # Utils
 import numpy as np
 from ..utils.constants import PipeOrientation
-from ..utils.constants import GameImages
+from ..utils.constants import GameImages, SpriteSizes, LazyClassAttribute
 
 
 class Pipe:
-    def __init__(self, starting_x, starting_y, width, height, pipe_orientation):
-        # Positional Vector
-        self.position = np.array([starting_x, starting_y])
+    __slots__ = ("position", "width", "height", "pipe_orientation")
+
+    def __init__(self, starting_x, starting_y, width, height, pipe_orientation, position=None):
+        # Positional Vector (optionally stored in a view of a bigger array)
+        self.position = np.empty(2) if position is None else position
+        self.position[:] = starting_x, starting_y
 
         # Size of Pipe
         self.width = width
@@ -21,23 +21,43 @@ class Pipe:
 
 
 class DualPipe:
+    PIPE_WIDTH, PIPE_HEIGHT = SpriteSizes.PIPE
+
     # Setting images
-    TOP_PIPE = flip(GameImages.PIPE, False, True)
-    BOTTOM_PIPE = GameImages.PIPE
-    PIPE_WIDTH = GameImages.PIPE.get_width()
-    PIPE_HEIGHT = GameImages.PIPE.get_height()
+    @LazyClassAttribute
+    def TOP_PIPE():
+        from pygame.transform import flip
+        return flip(GameImages.PIPE, False, True)
+
+    @LazyClassAttribute
+    def BOTTOM_PIPE():
+        return GameImages.PIPE
+
+    # Collision masks
+    @LazyClassAttribute
+    def TOP_PIPE_MASK():
+        from pygame.mask import from_surface
+        return from_surface(DualPipe.TOP_PIPE)
+
+    @LazyClassAttribute
+    def BOTTOM_PIPE_MASK():
+        from pygame.mask import from_surface
+        return from_surface(DualPipe.BOTTOM_PIPE)
+
+    __slots__ = ("pipe_id", "top_pipe", "bottom_pipe")
 
-    def __init__(self, pipe_id, starting_x, pipes_y):
+    def __init__(self, pipe_id, starting_x, pipes_y, positions=None):
         # Setting self id
         self.pipe_id = pipe_id
 
-        # Initializing pipes
+        # Initializing pipes (positions is an optional 2x2 array that stores both pipes' positions)
         self.top_pipe = Pipe(
             starting_x=starting_x,
             starting_y=pipes_y[0],
             width=DualPipe.PIPE_WIDTH,
             height=0,
-            pipe_orientation=PipeOrientation.TOP
+            pipe_orientation=PipeOrientation.TOP,
+            position=None if positions is None else positions[0]
         )
 
         self.bottom_pipe = Pipe(
@@ -45,13 +65,14 @@ class DualPipe:
             starting_y=pipes_y[1],
             width=DualPipe.PIPE_WIDTH,
             height=0,
-            pipe_orientation=PipeOrientation.BOTTOM
+            pipe_orientation=PipeOrientation.BOTTOM,
+            position=None if positions is None else positions[1]
         )
 
     def translate(self, pipe_velocity):
-        # Moving both pipes
-        self.top_pipe.position = np.subtract(self.top_pipe.position, pipe_velocity)
-        self.bottom_pipe.position = np.subtract(self.bottom_pipe.position, pipe_velocity)
+        # Moving both pipes in place
+        self.top_pipe.position -= pipe_velocity
+        self.bottom_pipe.position -= pipe_velocity
 
     def draw(self, game_window):
         # Drawing both pipes
@@ -0,0 +1,288 @@
+# Models
+from .bird import Bird
+from .bird_agent import BirdAgent
+from .pipe import DualPipe
+from .sensors import BirdSensors
+
+# Utils
+import numpy as np
+from ..utils.constants import LazyClassAttribute
+
+
+def get_column_intervals(mask):
+    # First and last solid row of every column of the sprite's mask
+    width, height = mask.get_size()
+    solid = np.array([[mask.get_at((x, y)) for x in range(width)] for y in range(height)], dtype=bool)
+
+    top = np.where(solid.any(axis=0), solid.argmax(axis=0), height)
+    bottom = np.where(solid.any(axis=0), height - 1 - solid[::-1].argmax(axis=0), -1)
+    return top, bottom
+
+
+class BirdPopulation:
+    # Column intervals of the sprites, the solid pixels of every column of these sprites are contiguous,
+    # so two sprites overlap if and only if one of their shared columns has overlapping intervals
+    @LazyClassAttribute
+    def BIRD_COLUMNS():
+        return get_column_intervals(BirdAgent.MASKS[0])
+
+    @LazyClassAttribute
+    def TOP_PIPE_COLUMNS():
+        return get_column_intervals(DualPipe.TOP_PIPE_MASK)
+
+    @LazyClassAttribute
+    def BOTTOM_PIPE_COLUMNS():
+        return get_column_intervals(DualPipe.BOTTOM_PIPE_MASK)
+
+    # Pixel perfect collisions or analytic ones, where the bird is a box or a circle
+    COLLISION_MODES = ("pixel", "box", "circle")
+
+    # Combining an agent's results across tracks: mean, min or a quantile between 0 and 1
+    AGGREGATIONS = ("mean", "min")
+    BIRD_SIZE = np.array(BirdAgent.SIZE)
+
+    def __init__(
+            self,
+            agents, starting_position, max_height, total_pipes, closest_pipe,
+            networks=None, collision_mode="pixel", layouts=None, aggregation="mean", sensors=None
+    ):
+        if collision_mode not in BirdPopulation.COLLISION_MODES:
+            raise ValueError("Unknown collision mode: {}".format(collision_mode))
+        if aggregation not in BirdPopulation.AGGREGATIONS and not (
+                isinstance(aggregation, float) and 0 <= aggregation <= 1
+        ):
+            raise ValueError("Unknown aggregation: {}".format(aggregation))
+
+        # Agents backing the population (genomes and networks)
+        self.agents = agents
+        self.networks = networks
+        self.collision_mode = collision_mode
+
+        # Every agent plays every track in layouts (the Y of both pipes of every dual pipe), one bird
+        # per agent and track, track after track. All tracks share the pipes' X, so a single track moves them
+        self.layouts = layouts
+        self.aggregation = aggregation
+        self.number_tracks = 1 if layouts is None else len(layouts)
+        self.agent_index = np.tile(np.arange(len(agents)), self.number_tracks)
+        self.track_index = np.repeat(np.arange(self.number_tracks), len(agents))
+        size = len(agents) * self.number_tracks
+
+        # Struct of arrays with the state of every bird
+        self.position = np.empty((size, 2))
+        self.position[:] = starting_position
+        self.velocity = np.zeros((size, 2))
+        self.alive = np.ones(size, dtype=bool)
+        self.fitness = np.zeros(size)
+        self.pipes_passed = np.zeros(size, dtype=int)
+
+        # Survivors' indices in a stable order, with the row of their network, compacted only when birds die
+        self.alive_index = np.arange(size)
+        self.alive_rows = self.agent_index.copy()
+
+        # Flaps of the ticks on which the birds do not think
+        self.no_flaps = np.zeros(size, dtype=bool)
+        self.no_flaps.flags.writeable = False
+
+        # Number of bird updates performed (throughput metric)
+        self.bird_ticks = 0
+
+        # Population constants
+        self.max_height = max_height
+        self.total_pipes = total_pipes
+        self.bird_diameter = agents[0].bird_diameter if size > 0 else 0
+
+        # Inputs of the networks, the same pipeline for batched and per bird inference
+        self.sensors = sensors if sensors is not None else BirdSensors(bird_diameter=self.bird_diameter)
+
+        # Every living bird flies towards the same pipe
+        self.closest_pipe = None
+        self.pipes_y = None
+        self.gap_features = None
+        self.set_closest_pipe(closest_pipe)
+
+    def set_closest_pipe(self, closest_pipe):
+        # On several tracks, the closest pipe's Y is looked up once for every bird
+        self.closest_pipe = closest_pipe
+        if self.layouts is not None and closest_pipe is not None:
+            self.pipes_y = self.layouts[self.track_index, closest_pipe.pipe_id]
+
+        # The gap's features do not change until the next pipe
+        if closest_pipe is not None:
+            self.gap_features = self.sensors.get_gap_features(closest_pipe, pipes_y=self.pipes_y)
+
+    def get_pipes_y(self, index, dual_pipe):
+        # Y of the top and bottom pipes, a single value on one track or one per bird otherwise
+        if self.layouts is None:
+            return dual_pipe.top_pipe.position[1], dual_pipe.bottom_pipe.position[1]
+        return self.pipes_y[index, 0], self.pipes_y[index, 1]
+
+    def is_game_over(self):
+        return len(self.alive_index) == 0
+
+    def count_alive(self):
+        return len(self.alive_index)
+
+    def remove_birds(self, dead):
+        # dead is a mask over the survivors, nothing is reallocated on ticks without deaths
+        if dead.any():
+            self.alive[self.alive_index[dead]] = False
+            survivors = ~dead
+            self.alive_index = self.alive_index[survivors]
+            self.alive_rows = self.alive_rows[survivors]
+
+    def get_fitness(self):
+        return self.aggregate(self.fitness)
+
+    def aggregate(self, values):
+        # Combining every agent's results across the tracks, a single track needs no aggregation
+        if self.number_tracks == 1:
+            return values
+
+        values = values.reshape(self.number_tracks, -1)
+        if self.aggregation == "mean":
+            return values.mean(axis=0)
+        elif self.aggregation == "min":
+            return values.min(axis=0)
+        else:
+            return np.quantile(values, self.aggregation, axis=0)
+
+    def think(self):
+        # Pipe features are computed once and shared by all birds (the gap's are per bird on several tracks)
+        index = self.alive_index
+        top_pipe_height, bottom_pipe_height = self.gap_features
+        if self.layouts is not None:
+            top_pipe_height, bottom_pipe_height = top_pipe_height[index], bottom_pipe_height[index]
+        inputs = self.sensors.get_inputs(
+            birds_y=self.position[index, 1],
+            farthest_corner=self.sensors.get_corner_feature(self.closest_pipe),
+            top_pipe_height=top_pipe_height,
+            bottom_pipe_height=bottom_pipe_height
+        )
+
+        # Batched forward pass of every living bird's network
+        flaps = np.zeros(len(self.alive), dtype=bool)
+        if self.networks is not None:
+            # Every network is evaluated once per track it is still alive on
+            rows = None if len(index) == len(self.agents) and self.number_tracks == 1 else self.alive_rows
+            flaps[index] = self.networks.activate(rows, inputs)[:, 0] > 0.5
+            return flaps
+
+        # Forward pass of every living bird's network, one by one
+        for bird_inputs, bird_index, row in zip(inputs.tolist(), index, self.alive_rows):
+            output = self.agents[row].brain.activate(bird_inputs)
+            flaps[bird_index] = output[0] > 0.5
+
+        return flaps
+
+    def check_collision(self, index, dual_pipe):
+        if self.collision_mode == "pixel":
+            return self.check_collision_pixel(index, dual_pipe)
+
+        # Same geometry as Bird.check_collision with the real sizes of the sprites, the circle fits the bird's height
+        half_width, half_height = BirdPopulation.BIRD_SIZE / 2
+        centers = self.position[index] + BirdPopulation.BIRD_SIZE / 2
+        top_pipe_y, bottom_pipe_y = self.get_pipes_y(index, dual_pipe)
+
+        if self.collision_mode == "circle":
+            return Bird.collides_circle(
+                center_x=centers[:, 0],
+                center_y=centers[:, 1],
+                radius=half_height,
+                pipe_x=dual_pipe.top_pipe.position[0],
+                pipe_width=DualPipe.PIPE_WIDTH,
+                gap_top=top_pipe_y + DualPipe.PIPE_HEIGHT,
+                gap_bottom=bottom_pipe_y
+            )
+        return Bird.collides(
+            center_x=centers[:, 0],
+            center_y=centers[:, 1],
+            half_width=half_width,
+            half_height=half_height,
+            pipe_x=dual_pipe.top_pipe.position[0],
+            pipe_width=DualPipe.PIPE_WIDTH,
+            gap_top=top_pipe_y + DualPipe.PIPE_HEIGHT,
+            gap_bottom=bottom_pipe_y
+        )
+
+    def check_collision_pixel(self, index, dual_pipe):
+        # Every bird shares the same X position, so the overlapping columns are the same for all of them
+        bird_top, bird_bottom = BirdPopulation.BIRD_COLUMNS
+        collisions = np.zeros(len(index), dtype=bool)
+
+        for pipe, pipe_y, (pipe_top, pipe_bottom) in zip(
+                (dual_pipe.top_pipe, dual_pipe.bottom_pipe),
+                self.get_pipes_y(index, dual_pipe),
+                (BirdPopulation.TOP_PIPE_COLUMNS, BirdPopulation.BOTTOM_PIPE_COLUMNS),
+        ):
+            # Same offsets that pygame's Mask.overlap would receive
+            offset_x = int(pipe.position[0] - self.position[index[0], 0])
+            offset_y = np.ceil(pipe_y - self.position[index, 1])[:, np.newaxis]
+
+            # Columns shared by the bird and the pipe
+            bird_columns = np.arange(max(0, offset_x), min(len(bird_top), offset_x + len(pipe_top)))
+            if len(bird_columns) == 0:
+                continue
+            pipe_columns = bird_columns - offset_x
+
+            collisions |= np.any(
+                (bird_top[bird_columns] <= pipe_bottom[pipe_columns] + offset_y) &
+                (pipe_top[pipe_columns] + offset_y <= bird_bottom[bird_columns]),
+                axis=1
+            )
+
+        return collisions
+
+    def update(self, flaps, lap=None):
+        if self.closest_pipe is None:
+            return
+
+        index = self.alive_index
+        if len(index) == 0:
+            return
+
+        self.bird_ticks += len(index)
+
+        # Calculate new velocity
+        self.velocity[index[flaps[index]]] = Bird.FLAP_VELOCITY
+        self.velocity[index] += Bird.GRAVITY
+
+        # Calculate new position
+        self.position[index] += self.velocity[index]
+
+        # Clamping to the floor and the ceiling
+        heights = self.position[index, 1]
+        out_of_bounds = (heights > self.max_height) | (heights < 0)
+        self.position[index, 1] = np.clip(heights, 0, self.max_height)
+        if lap:
+            lap("physics")
+
+        # Check Collisions
+        self.remove_birds(out_of_bounds | self.check_collision(index, self.closest_pipe))
+        if lap:
+            lap("collision")
+
+        # Increase distance score of the survivors
+        self.fitness[self.alive_index] += 0.01
+
+    def increase_pipe_score(self, passed_pipe, closest_pipe):
+        if passed_pipe:
+            index = self.alive_index
+            self.fitness[index] += 5
+            self.pipes_passed[index] += 1
+            self.remove_birds(self.pipes_passed[index] == self.total_pipes)
+            self.set_closest_pipe(closest_pipe)
+
+    def push_results(self):
+        # Writing the final state back to the agents and their genomes (replayed birds have none),
+        # the vectors are views of a single copy
+        # On several tracks, positions come from the first one and scores are aggregated
+        position, velocity = self.position.copy(), self.velocity.copy()
+        alive = self.alive.reshape(self.number_tracks, -1).any(axis=0)
+        pipes_passed, fitness = self.aggregate(self.pipes_passed), self.get_fitness()
+        for index, agent in enumerate(self.agents):
+            agent.position = position[index]
+            agent.velocity = velocity[index]
+            agent.pipes_passed = pipes_passed[index].item()
+            agent.game_over = not alive[index]
+            if agent.genome is not None:
+                agent.genome.fitness = float(fitness[index])
@@ -0,0 +1,49 @@
+# Utils
+import numpy as np
+
+
+class BirdSensors:
+    # Bird's Y position, closest pipe's farthest corner X position, top and bottom pipes' heights
+    NUMBER_INPUTS = 4
+
+    def __init__(self, bird_diameter, input_ranges=None):
+        self.bird_diameter = bird_diameter
+
+        # Optional linear map of every input from its (low, high) range to [-1, 1], the output range of tanh
+        self.input_ranges = input_ranges
+        self.centers = None
+        self.half_ranges = None
+        if input_ranges is not None:
+            low, high = np.array(input_ranges, dtype=float).T
+            self.centers = (high + low) / 2
+            self.half_ranges = (high - low) / 2
+
+    def get_corner_feature(self, dual_pipe):
+        # Changes every tick, the same for every bird
+        top_pipe = dual_pipe.top_pipe
+        return top_pipe.position[0] + top_pipe.width + self.bird_diameter / 2
+
+    def get_gap_features(self, dual_pipe, pipes_y=None):
+        # Constant while the pipe is the closest one, one per bird when every bird has its own track (pipes_y)
+        if pipes_y is None:
+            top_pipe_y, bottom_pipe_y = dual_pipe.top_pipe.position[1], dual_pipe.bottom_pipe.position[1]
+        else:
+            top_pipe_y, bottom_pipe_y = pipes_y[:, 0], pipes_y[:, 1]
+
+        return (
+            top_pipe_y + dual_pipe.top_pipe.height + self.bird_diameter / 2,
+            bottom_pipe_y - self.bird_diameter / 2
+        )
+
+    def get_inputs(self, birds_y, farthest_corner, top_pipe_height, bottom_pipe_height):
+        # One row of inputs per bird, pipe features are broadcast to every bird
+        inputs = np.empty((len(birds_y), BirdSensors.NUMBER_INPUTS))
+        inputs[:, 0] = birds_y
+        inputs[:, 1] = farthest_corner
+        inputs[:, 2] = top_pipe_height
+        inputs[:, 3] = bottom_pipe_height
+
+        if self.centers is not None:
+            inputs -= self.centers
+            inputs /= self.half_ranges
+        return inputs
@@ -4,15 +4,18 @@ from .pipe import DualPipe
 # Utils
 import numpy as np
 from math import ceil
-from random import uniform
 
 
 class PipeTrack:
+    # Range of the top pipes' bottom edge, as a fraction of the game's height
+    GAP_HEIGHTS = (0.05, 0.60)
+
     def __init__(
             self,
             pipe_distance, pipe_velocity, number_pipes,
             game_dimensions,
-            bird_x, bird_width
+            bird_x, bird_width,
+            seed=None, layout=None, pipes_gap=None, gap_heights=None
     ):
         # Initializing constants
         self.game_window_dimensions = game_dimensions
@@ -20,64 +23,114 @@ class PipeTrack:
         self.pipe_distance = ceil((pipe_distance + DualPipe.PIPE_WIDTH) * 1.05)
         self.pipe_velocity = pipe_velocity
         self.number_pipes = number_pipes
-        self.pipes_gap = 5 * self.game_window_dimensions[1] // 16
+        self.pipes_gap = 5 * self.game_window_dimensions[1] // 16 if pipes_gap is None else pipes_gap
+        self.gap_heights = PipeTrack.GAP_HEIGHTS if gap_heights is None else gap_heights
 
         self.pipe_0_threshold = bird_x - DualPipe.PIPE_WIDTH + (bird_width // 2)
 
-        # Creating empty track
+        # Seed of the track (a fixed seed makes the track reproducible)
+        self.seed = seed
+
+        # Raw Pipe track: the Y position of the top and bottom pipe of every dual pipe
         self.pipes_track = None
 
-        # Creating random raw Pipe track
-        self.create_random_track()
+        # Creating random raw Pipe track, unless an already generated one is shared
+        if layout is None:
+            self.create_random_track()
+        else:
+            self.pipes_track = layout
 
-        # Lazy Loading
+        # Lazy Loading: the visible pipes live in a fixed capacity ring buffer whose
+        # dual pipes store their positions in a single array, [slot, top/bottom, x/y]
         self.number_pipes_to_display = self.game_window_dimensions[0] // self.pipe_distance
-        self.pipes_queue = np.array([self.pipes_track[0]])
-        self.next_pipe_counter = self.pipe_distance
-        self.next_pipe = 1
-
-        # Setting flags
-        self.track_complete = False
+        self.queue_capacity = ceil(self.game_window_dimensions[0] / self.pipe_distance) + 2
+        self.pipes_positions = np.zeros((self.queue_capacity, 2, 2))
+        self.pipes_ring = [
+            DualPipe(pipe_id=None, starting_x=0, pipes_y=(0, 0), positions=self.pipes_positions[slot])
+            for slot in range(self.queue_capacity)
+        ]
+        self.reset_queue()
+
+    @staticmethod
+    def get_seed(seed, generation, number_tracks=None):
+        # Every generation gets its own track, unless a fixed set of tracks is rotated
+        if seed is None:
+            return None
+        elif number_tracks is None:
+            return seed + generation
+        else:
+            return seed + 1 + (generation - 1) % number_tracks
+
+    @staticmethod
+    def generate_layout(seed, number_pipes, height, pipes_gap, gap_heights=GAP_HEIGHTS):
+        # Calculating Pipes Height
+        heights = np.random.default_rng(seed).uniform(*gap_heights, number_pipes)
+        layout = np.empty((number_pipes, 2), dtype=int)
+        layout[:, 0] = -DualPipe.PIPE_HEIGHT + np.ceil(height * heights)
+        layout[:, 1] = DualPipe.PIPE_HEIGHT + layout[:, 0] + pipes_gap
+
+        # Tracks may be shared between games, so they are read only
+        layout.flags.writeable = False
+        return layout
+
+    def get_input_ranges(self, bird_diameter, max_height):
+        # Every value each sensor input can take on this track: bird's Y, farthest corner's X, top and bottom pipes' heights
+        top_pipe_y = -DualPipe.PIPE_HEIGHT + np.ceil(self.game_window_dimensions[1] * np.array(self.gap_heights))
+        farthest_corner = np.array([self.pipe_0_threshold, self.game_window_dimensions[0]]) + DualPipe.PIPE_WIDTH
+        return [
+            (0, max_height),
+            tuple((farthest_corner + bird_diameter / 2).tolist()),
+            tuple((top_pipe_y + bird_diameter / 2).tolist()),
+            tuple((top_pipe_y + DualPipe.PIPE_HEIGHT + self.pipes_gap - bird_diameter / 2).tolist()),
+        ]
 
     def create_random_track(self):
         # Creating random raw Pipe track
-        dual_pipes = []
-        for pipe in range(self.number_pipes):
-            # Both pipes start at the edge of the screen
-            starting_x = self.game_window_dimensions[0]
-
-            # Calculating Pipes Height
-            top_pipe_y = -DualPipe.PIPE_HEIGHT + ceil(self.game_window_dimensions[1] * uniform(0.05, 0.60))
-            bottom_pipe_y = DualPipe.PIPE_HEIGHT + top_pipe_y + self.pipes_gap
-            # top_pipe_y = -DualPipePygame.PIPE_HEIGHT - 200
-            # bottom_pipe_y = DualPipePygame.PIPE_HEIGHT
-
-            # Creating Dual Pipe
-            dual_pipe = DualPipe(
-                pipe_id=pipe,
-                starting_x=starting_x,
-                pipes_y=np.array([top_pipe_y, bottom_pipe_y]),
-            )
-
-            # Appending to track
-            dual_pipes.append(dual_pipe)
-
-        self.pipes_track = np.array(dual_pipes)
+        self.pipes_track = PipeTrack.generate_layout(
+            seed=self.seed,
+            number_pipes=self.number_pipes,
+            height=self.game_window_dimensions[1],
+            pipes_gap=self.pipes_gap,
+            gap_heights=self.gap_heights
+        )
+
+    def reset_queue(self):
+        # Only the first pipe is visible
+        self.first_slot = 0
+        self.queue_length = 0
+        self.add_pipe_to_queue(pipe=0)
+        self.next_pipe_counter = self.pipe_distance
 
-    def add_pipe_to_queue(self):
-        # Obtain new pipe and add it to queue
-        self.pipes_queue = np.append(self.pipes_queue, self.pipes_track[self.next_pipe])
+    @property
+    def pipes_queue(self):
+        # Visible dual pipes, the closest one first
+        return [
+            self.pipes_ring[(self.first_slot + pipe) % self.queue_capacity]
+            for pipe in range(self.queue_length)
+        ]
+
+    def closest_pipe(self):
+        # If the track has been completed, return Null
+        return self.pipes_ring[self.first_slot] if self.queue_length > 0 else None
+
+    def add_pipe_to_queue(self, pipe=None):
+        # Obtain new pipe and write it in the next free slot, both pipes start at the edge of the screen
+        pipe = self.next_pipe if pipe is None else pipe
+        slot = (self.first_slot + self.queue_length) % self.queue_capacity
+        self.pipes_positions[slot, :, 0] = self.game_window_dimensions[0]
+        self.pipes_positions[slot, :, 1] = self.pipes_track[pipe]
+        self.pipes_ring[slot].pipe_id = pipe
+        self.queue_length += 1
 
         # Increase next pipe counter
-        self.next_pipe += 1
+        self.next_pipe = pipe + 1
 
         # Set flag
         self.track_complete = self.next_pipe == self.number_pipes
 
-    def draw(self, game_window):
-        # Translate pipes first
-        for pipes in self.pipes_queue:
-            pipes.translate(pipe_velocity=self.pipe_velocity)
+    def update(self):
+        # Translate every pipe with a single in place operation
+        self.pipes_positions -= self.pipe_velocity
 
         # Decrease next pipe counter
         self.next_pipe_counter -= self.pipe_velocity[0]
@@ -91,25 +144,22 @@ class PipeTrack:
 
         # Check first pipe's x position
         passed_pipe = False
-        if len(self.pipes_queue) > 0 and self.pipes_queue[0].top_pipe.position[0] <= self.pipe_0_threshold:
-            # Pop first dual pipe
-            self.pipes_queue = self.pipes_queue[1:]
+        if self.queue_length > 0 and self.pipes_positions[self.first_slot, 0, 0] <= self.pipe_0_threshold:
+            # Pop first dual pipe (its slot stays untouched until the queue wraps around)
+            self.first_slot = (self.first_slot + 1) % self.queue_capacity
+            self.queue_length -= 1
             passed_pipe = True
 
+        return passed_pipe
+
+    def draw(self, game_window):
         # Draw pipes
         for dual_pipe in self.pipes_queue:
             dual_pipe.draw(game_window=game_window)
 
-        return passed_pipe
-
     def reset(self):
         # Creating track again
         self.create_random_track()
 
         # Reset Lazy loading
-        self.pipes_queue = np.array([self.pipes_track[0]])
-        self.next_pipe_counter = self.pipe_distance
-        self.next_pipe = 1
-
-        # Setting flags
-        self.track_complete = False
+        self.reset_queue()
@@ -0,0 +1,163 @@
+# Multiprocessing
+from multiprocessing import Pool
+
+# Game
+from .flappy_bird_ai import FlappyBirdAI
+from .models.track import PipeTrack
+from .models.curriculum import TrackCurriculum
+
+# Utils
+from random import Random
+from time import perf_counter
+from .utils.telemetry import TelemetryWriter, summarize_generation
+from .utils.recording import GenerationRecording, get_recording_path
+from .ai.network_drawer import NetworkDrawer
+
+# Headless game of every worker process
+_worker_game = None
+
+
+def initialize_worker(number_pipes, game_options):
+    global _worker_game
+    _worker_game = FlappyBirdAI(number_pipes=number_pipes, headless=True, **game_options)
+
+    # Workers record their shard, the parent merges and saves the generation's recording
+    _worker_game.recording_directory = None
+
+
+def evaluate_shard(generation, track_seed, genomes, config, curriculum_level=None):
+    # Every worker plays the same generation on an identical copy of the track (as hard as the parent's curriculum)
+    _worker_game.generation = generation - 1
+    if curriculum_level is not None:
+        _worker_game.curriculum.level = curriculum_level
+    _, fittest = _worker_game.simulation(genomes, config, track_seed=track_seed)
+
+    # Sending back the fitness and pipes passed of every genome, the fittest bird and the shard's recording
+    fitnesses = [(genome_id, genome.fitness) for genome_id, genome in genomes]
+    return fitnesses, _worker_game.last_pipes_passed.tolist(), fittest, _worker_game.last_recording
+
+
+class ParallelFlappyBirdAI:
+    def __init__(
+            self, number_pipes, num_workers, seed=None, number_tracks=None, timeout=None, telemetry=False,
+            draw_network=False, record=False, curriculum=False, **game_options
+    ):
+        # Policies that stop on the whole population's state would stop every shard at a different tick, the max
+        # ticks budget is the same for every shard and is still allowed
+        if game_options.get("stop_at_fitness_threshold") or game_options.get("stagnation_ticks") is not None:
+            raise ValueError(
+                "stop_at_fitness_threshold and stagnation_ticks need the whole population, train with a single process"
+            )
+
+        # Initializing simulation variables
+        self.generation = 0
+        self.number_pipes = number_pipes
+        self.num_workers = num_workers
+        self.random = Random()
+        self.seed = self.random.randrange(2 ** 32) if seed is None and number_tracks is not None else seed
+        self.number_tracks = number_tracks
+        self.timeout = timeout
+
+        # Only the parent writes the telemetry and draws the fittest network, with the results of every worker
+        self.telemetry = TelemetryWriter() if telemetry else None
+        self.network_drawer = NetworkDrawer() if draw_network else None
+        self.record = record
+        self.last_recording = None
+
+        # The parent's curriculum sets the difficulty of every worker's tracks
+        self.curriculum = TrackCurriculum(number_pipes=number_pipes) if curriculum else None
+
+        # Every worker owns a headless game
+        self.pool = None
+        self.start_workers(dict(game_options, number_tracks=number_tracks, record=record, curriculum=curriculum))
+
+    def start_workers(self, game_options):
+        self.pool = Pool(
+            processes=self.num_workers,
+            initializer=initialize_worker,
+            initargs=(self.number_pipes, game_options)
+        )
+
+    def evaluate_shards(self, jobs):
+        # Arguments of evaluate_shard for every shard, results in the same order
+        jobs = [self.pool.apply_async(evaluate_shard, job) for job in jobs]
+        return [job.get(timeout=self.timeout) for job in jobs]
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        if getattr(self, "pool", None) is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+        # The telemetry and the drawing still queued are written
+        if getattr(self, "telemetry", None) is not None:
+            self.telemetry.close()
+        if getattr(self, "network_drawer", None) is not None:
+            self.network_drawer.close()
+
+    def get_track_seed(self):
+        # Workers need an explicit seed to build identical tracks, drawn from the game's own generator (not NEAT's)
+        if self.seed is None:
+            return self.random.randrange(2 ** 32)
+        return PipeTrack.get_seed(seed=self.seed, generation=self.generation, number_tracks=self.number_tracks)
+
+    # Setting up simulation
+    def simulation(self, genomes, config):
+        # Update simulation variables
+        self.generation += 1
+        generation_start = perf_counter()
+        track_seed = self.get_track_seed()
+
+        # Sharding the genomes across the workers
+        genomes = list(genomes)
+        curriculum_level = self.curriculum.level if self.curriculum is not None else None
+        results = self.evaluate_shards([
+            (self.generation, track_seed, genomes[shard::self.num_workers], config, curriculum_level)
+            for shard in range(min(self.num_workers, len(genomes)))
+        ])
+
+        # Assigning the fitness computed by the workers
+        genomes_by_id = dict(genomes)
+        fittest = None
+        pipes_passed = []
+        recordings = []
+        ticks = 0
+        for fitnesses, shard_pipes_passed, shard_fittest, shard_recording in results:
+            recordings.append(shard_recording)
+            for genome_id, fitness in fitnesses:
+                genomes_by_id[genome_id].fitness = fitness
+            pipes_passed.extend(shard_pipes_passed)
+            ticks = max(ticks, shard_fittest.ticks)
+
+            if fittest is None or shard_fittest < fittest:
+                fittest = shard_fittest
+
+        # The fittest bird refers to the parent's genome
+        fittest.genome = genomes_by_id[fittest.bird_id]
+        if self.curriculum is not None:
+            self.curriculum.update(best_pipes_passed=max(pipes_passed), total_pipes=fittest.total_pipes)
+        if self.network_drawer is not None:
+            self.network_drawer.submit(fittest.genome, config)
+
+        # A single recording of the generation, every shard played the same tracks
+        if self.record:
+            self.last_recording = GenerationRecording.merge(recordings)
+            self.last_recording.save(get_recording_path(self.generation))
+
+        # Streaming the generation's statistics
+        if self.telemetry is not None:
+            self.telemetry.write(summarize_generation(
+                generation=self.generation,
+                fitness=[genome.fitness for genome in genomes_by_id.values()],
+                pipes_passed=pipes_passed,
+                total_pipes=fittest.total_pipes,
+                ticks=ticks,
+                termination=fittest.termination,
+                seconds=perf_counter() - generation_start
+            ))
+
+        # Return current generation and fittest
+        return self.generation, fittest
@@ -0,0 +1,115 @@
+# Pygame stuff
+from pygame.display import set_mode, update
+from pygame.event import get
+from pygame import QUIT, quit
+
+# Models
+from .models.floor import GameFloor
+from .models.bird_agent import BirdAgent
+from .models.pipe import DualPipe
+
+# Utils
+import numpy as np
+from threading import Thread, Condition
+from time import perf_counter
+from .utils.constants import GameImages
+
+
+class GameRenderer:
+    def __init__(self, window_dimensions, floor_height, render_every=1, target_fps=None, threaded=False):
+        # Initializing constants
+        self.window_dimensions = window_dimensions
+        self.background_position = np.array([0, -150])
+
+        # Frame skipping: draw every Nth tick and, optionally, no faster than the target FPS
+        self.render_every = render_every
+        self.frame_time = 0 if target_fps is None else 1 / target_fps
+        self.last_frame = -float("inf")
+        self.last_tick = 0
+
+        # Initializing Floor
+        self.GAME_FLOOR = GameFloor(height=floor_height)
+
+        # Flags
+        self.closed = False
+
+        # The window belongs to the thread that draws
+        self.threaded = threaded
+        self.GAME_WINDOW = None
+        if threaded:
+            self.pending_snapshot = None
+            self.condition = Condition()
+            self.thread = Thread(target=self.render_loop, daemon=True)
+            self.thread.start()
+        else:
+            self.GAME_WINDOW = set_mode(self.window_dimensions)
+
+    def should_render(self, tick):
+        if tick % self.render_every != 0:
+            return False
+        return perf_counter() - self.last_frame >= self.frame_time
+
+    def submit(self, snapshot):
+        self.last_frame = perf_counter()
+        if not self.threaded:
+            self.draw(snapshot)
+            return
+
+        # Only the latest snapshot is kept, the simulation never waits for the renderer
+        with self.condition:
+            self.pending_snapshot = snapshot
+            self.condition.notify()
+
+    def render_loop(self):
+        self.GAME_WINDOW = set_mode(self.window_dimensions)
+        while not self.closed:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending_snapshot is not None or self.closed, timeout=0.1)
+                snapshot, self.pending_snapshot = self.pending_snapshot, None
+
+            if snapshot is not None:
+                self.draw(snapshot)
+            else:
+                self.dispatch_events()
+
+    def dispatch_events(self):
+        for event in get():
+            if event.type == QUIT:
+                quit()
+                self.closed = True
+
+    def draw(self, snapshot):
+        # Dispatch events before proceeding
+        self.dispatch_events()
+        if self.closed:
+            return
+
+        # First: Drawing Background first
+        self.GAME_WINDOW.blit(GameImages.BACKGROUND, self.background_position)
+
+        # Second: Drawing pipes
+        for top_pipe_position, bottom_pipe_position in snapshot.pipes_positions:
+            self.GAME_WINDOW.blit(DualPipe.TOP_PIPE, top_pipe_position)
+            self.GAME_WINDOW.blit(DualPipe.BOTTOM_PIPE, bottom_pipe_position)
+
+        # Third: Drawing Floor, moved by every tick since the last frame (ticks restart every generation)
+        elapsed_ticks = snapshot.tick - self.last_tick
+        self.GAME_FLOOR.update(ticks=elapsed_ticks if elapsed_ticks >= 0 else snapshot.tick)
+        self.GAME_FLOOR.draw(game_window=self.GAME_WINDOW)
+        self.last_tick = snapshot.tick
+
+        # Fourth: Drawing birds, every living bird shares the same animation frame
+        img_to_show = BirdAgent.get_animation_frame(snapshot.tick % 20)
+        for position in snapshot.birds_positions:
+            self.GAME_WINDOW.blit(img_to_show, position)
+
+        # Fifth: Update canvas
+        update()
+
+    def close(self):
+        self.closed = True
+        if self.threaded:
+            with self.condition:
+                self.condition.notify()
+            self.thread.join()
+        quit()
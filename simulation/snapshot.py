@@ -0,0 +1,23 @@
+# Utils
+import numpy as np
+
+
+class GameSnapshot:
+    def __init__(self, tick, birds_positions, pipes_positions):
+        # Everything the renderer needs, copied so the simulation can keep going
+        self.tick = tick
+        self.birds_positions = birds_positions
+        self.pipes_positions = pipes_positions
+
+    @staticmethod
+    def capture(tick, game_track, population):
+        # Only the birds on the first track, the one on screen
+        agents = len(population.agents)
+        return GameSnapshot(
+            tick=tick,
+            birds_positions=population.position[:agents][population.alive[:agents]],
+            pipes_positions=np.array([
+                [dual_pipe.top_pipe.position, dual_pipe.bottom_pipe.position]
+                for dual_pipe in game_track.pipes_queue
+            ])
+        )
@@ -0,0 +1,34 @@
+# Utils
+from time import perf_counter, sleep
+
+
+class SimulationClock:
+    # Falling further behind than this (e.g. while the window is dragged) restarts the clock instead of catching up
+    MAX_LAG = 0.25
+
+    def __init__(self, ticks_per_second=None, decision_interval=1):
+        # Physics always advance by one fixed step per tick, the clock only paces the ticks in real time
+        # (no pacing without ticks_per_second) and decides on which ticks the birds think
+        self.tick_time = 0 if ticks_per_second is None else 1 / ticks_per_second
+        self.decision_interval = decision_interval
+        self.start = None
+        self.start_tick = 0
+
+    def should_decide(self, tick):
+        return tick % self.decision_interval == 0
+
+    def restart(self, tick=0):
+        self.start = perf_counter()
+        self.start_tick = tick
+
+    def wait(self, tick):
+        if self.tick_time == 0:
+            return
+        if self.start is None:
+            self.restart(tick)
+
+        delay = (tick - self.start_tick) * self.tick_time - (perf_counter() - self.start)
+        if delay > 0:
+            sleep(delay)
+        elif delay < -SimulationClock.MAX_LAG:
+            self.restart(tick)
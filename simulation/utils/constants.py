@@ -1,10 +1,7 @@
-# Game
-from pygame.transform import scale2x
-from pygame.image import load
-
 # Utils
 from enum import Enum
 from os.path import join, split, dirname
+from struct import unpack
 
 
 class PipeOrientation(Enum):
@@ -12,16 +9,69 @@ class PipeOrientation(Enum):
     BOTTOM = 2
 
 
+class Termination(Enum):
+    GAME_OVER = "Every bird crashed or completed the track"
+    WINDOW_CLOSED = "Window closed"
+    MAX_TICKS = "Reached the max ticks budget"
+    FITNESS_THRESHOLD = "Fittest bird reached the fitness threshold"
+    STAGNATION = "No bird passed a new pipe for too long"
+
+
 def get_assets_directory():
     return join(split(dirname(__file__))[0], 'assets')
 
 
+class LazyClassAttribute:
+    def __init__(self, loader):
+        # Class attribute computed by the loader on first access and cached afterwards
+        self.loader = loader
+        self.value = None
+        self.loaded = False
+
+    def __get__(self, instance, owner):
+        if not self.loaded:
+            self.value = self.loader()
+            self.loaded = True
+        return self.value
+
+
+def load_image(file_name):
+    # Pygame is only imported once an image is needed (rendering or pixel perfect collisions)
+    from pygame.image import load
+    from pygame.transform import scale2x
+
+    return scale2x(load(join(get_assets_directory(), file_name)))
+
+
+def read_sprite_size(file_name):
+    # Width and height straight from the PNG header, doubled like scale2x does
+    with open(join(get_assets_directory(), file_name), "rb") as image_file:
+        width, height = unpack(">II", image_file.read(24)[16:])
+    return 2 * width, 2 * height
+
+
+class SpriteSizes:
+    # Sizes of the scaled sprites, physics only need these
+    BIRD = read_sprite_size("bird1.png")
+    PIPE = read_sprite_size("pipe.png")
+    FLOOR = read_sprite_size("floor.png")
+    BACKGROUND = read_sprite_size("background.png")
+
+
 class GameImages:
-    BIRD_ANIMATION = [
-        scale2x(
-            load(join(get_assets_directory(), "bird{}.png".format(x)))
-        ) for x in range(1, 4)
-    ]
-    PIPE = scale2x(load(join(get_assets_directory(), "pipe.png")))
-    FLOOR = scale2x(load(join(get_assets_directory(), "floor.png")))
-    BACKGROUND = scale2x(load(join(get_assets_directory(), "background.png")))
+    # Surfaces are loaded on first use and shared by every model
+    @LazyClassAttribute
+    def BIRD_ANIMATION():
+        return [load_image("bird{}.png".format(x)) for x in range(1, 4)]
+
+    @LazyClassAttribute
+    def PIPE():
+        return load_image("pipe.png")
+
+    @LazyClassAttribute
+    def FLOOR():
+        return load_image("floor.png")
+
+    @LazyClassAttribute
+    def BACKGROUND():
+        return load_image("background.png")
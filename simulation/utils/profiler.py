@@ -0,0 +1,69 @@
+# Utils
+import json
+from datetime import datetime
+from os import makedirs
+from os.path import join
+from time import perf_counter
+
+
+class PhaseProfiler:
+    # neat: time spent by NEAT (reproduction, speciation, logging) between two generations,
+    # wait: time the clock slept to pace a game with a window
+    PHASES = ("neat", "setup", "pipe_update", "think", "physics", "collision", "score", "render", "wait")
+
+    def __init__(self, log_directory="neat_logs", file_prefix="neat"):
+        # Machine readable output, one JSON line per generation (no file without a directory)
+        self.file_path = None
+        if log_directory is not None:
+            makedirs(log_directory, exist_ok=True)
+            self.file_path = join(
+                log_directory, "profile_{}_{}.jsonl".format(file_prefix, datetime.now().strftime("%Y_%m_%d-%H_%M"))
+            )
+
+        # Timings of the current generation
+        self.timings = dict.fromkeys(PhaseProfiler.PHASES, 0.0)
+        self.generation_start = None
+        self.last_lap = None
+        self.last_generation_end = None
+        self.last_record = None
+
+    def start_generation(self):
+        self.generation_start = self.last_lap = perf_counter()
+        self.timings = dict.fromkeys(PhaseProfiler.PHASES, 0.0)
+        if self.last_generation_end is not None:
+            self.timings["neat"] = self.generation_start - self.last_generation_end
+
+    def lap(self, phase):
+        # Time since the last lap goes to the phase that just finished
+        now = perf_counter()
+        self.timings[phase] += now - self.last_lap
+        self.last_lap = now
+
+    def end_generation(self, generation, ticks, birds, bird_ticks):
+        self.last_generation_end = perf_counter()
+        seconds = self.last_generation_end - self.generation_start
+        record = {
+            "generation": generation,
+            "ticks": ticks,
+            "birds": birds,
+            "seconds": seconds,
+            "ticks_per_second": ticks / seconds if seconds > 0 else 0.0,
+            "bird_ticks_per_second": bird_ticks / seconds if seconds > 0 else 0.0,
+            "phases": self.timings,
+        }
+
+        if self.file_path is not None:
+            with open(self.file_path, "a") as profile_file:
+                profile_file.write(json.dumps(record) + "\n")
+
+        self.last_record = record
+        return record
+
+    @staticmethod
+    def summary(record):
+        # Single line for the generation log
+        simulated = sum(seconds for phase, seconds in record["phases"].items() if phase != "neat") or 1.0
+        return "{:.0f} ticks/s | ".format(record["ticks_per_second"]) + ", ".join(
+            "{} {:.0f}%".format(phase, 100 * seconds / simulated)
+            for phase, seconds in record["phases"].items() if phase != "neat"
+        ) + " | neat {:.3f}s".format(record["phases"]["neat"])
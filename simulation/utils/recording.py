@@ -0,0 +1,110 @@
+# Utils
+import numpy as np
+from glob import glob
+from os import makedirs
+from os.path import join
+
+
+class FlapRecorder:
+    def __init__(self):
+        # One bit per bird and tick, packed as the generation runs
+        self.packed_ticks = []
+
+    def record(self, flaps):
+        self.packed_ticks.append(np.packbits(flaps))
+
+    def finish(self, generation, track_seed, layouts, bird_ids, collision_mode, termination):
+        # Transposed once the generation is over: every bird's flaps become a bit-packed row
+        ticks = len(self.packed_ticks)
+        flaps = np.unpackbits(np.array(self.packed_ticks, dtype=np.uint8).reshape(ticks, -1), axis=1)
+        return GenerationRecording(
+            generation=generation,
+            track_seed=track_seed,
+            layouts=layouts,
+            bird_ids=bird_ids,
+            collision_mode=collision_mode,
+            termination=termination.name,
+            ticks=ticks,
+            flaps=np.packbits(flaps[:, :len(bird_ids) * len(layouts)].T, axis=1)
+        )
+
+
+class GenerationRecording:
+    def __init__(self, generation, track_seed, layouts, bird_ids, collision_mode, termination, ticks, flaps):
+        # Everything needed to play a generation again without its networks: the tracks
+        # (K, pipes, 2), the genome keys and a bit-packed row of flaps per bird and track (track-major)
+        self.generation = generation
+        self.track_seed = track_seed
+        self.layouts = layouts
+        self.bird_ids = bird_ids
+        self.collision_mode = collision_mode
+        self.termination = termination
+        self.ticks = ticks
+        self.flaps = flaps
+
+    def get_flaps(self, tick):
+        # Every bird's decision at a tick, read straight from the packed bits (most significant bit first)
+        return ((self.flaps[:, tick >> 3] >> (7 - (tick & 7))) & 1).astype(bool)
+
+    @staticmethod
+    def merge(recordings):
+        # Shards of the same generation played on the same tracks, by different workers
+        first = recordings[0]
+        number_tracks = len(first.layouts)
+        columns = max(recording.flaps.shape[1] for recording in recordings)
+        flaps = np.concatenate([
+            np.pad(recording.flaps, ((0, 0), (0, columns - recording.flaps.shape[1]))).reshape(number_tracks, -1, columns)
+            for recording in recordings
+        ], axis=1)
+
+        longest = max(recordings, key=lambda recording: recording.ticks)
+        return GenerationRecording(
+            generation=first.generation,
+            track_seed=first.track_seed,
+            layouts=first.layouts,
+            bird_ids=np.concatenate([recording.bird_ids for recording in recordings]),
+            collision_mode=first.collision_mode,
+            termination=longest.termination,
+            ticks=longest.ticks,
+            flaps=flaps.reshape(-1, columns)
+        )
+
+    def save(self, file_path):
+        np.savez_compressed(
+            file_path,
+            generation=self.generation,
+            track_seed=-1 if self.track_seed is None else self.track_seed,
+            layouts=self.layouts,
+            bird_ids=self.bird_ids,
+            collision_mode=self.collision_mode,
+            termination=self.termination,
+            ticks=self.ticks,
+            flaps=self.flaps
+        )
+
+    @staticmethod
+    def load(file_path):
+        with np.load(file_path) as recording:
+            track_seed = int(recording["track_seed"])
+            return GenerationRecording(
+                generation=int(recording["generation"]),
+                track_seed=None if track_seed == -1 else track_seed,
+                layouts=recording["layouts"],
+                bird_ids=recording["bird_ids"],
+                collision_mode=str(recording["collision_mode"]),
+                termination=str(recording["termination"]),
+                ticks=int(recording["ticks"]),
+                flaps=recording["flaps"]
+            )
+
+
+def get_recording_path(generation, directory="neat_recordings"):
+    makedirs(directory, exist_ok=True)
+    return join(directory, "generation_{:05d}.npz".format(generation))
+
+
+def find_latest_recording(directory="neat_recordings"):
+    files = sorted(glob(join(directory, "generation_*.npz")))
+    if len(files) == 0:
+        raise FileNotFoundError("No recordings in {}".format(directory))
+    return files[-1]
@@ -0,0 +1,146 @@
+# Utils
+import json
+import numpy as np
+from datetime import datetime
+from glob import glob
+from os import makedirs
+from os.path import join
+from queue import Queue, Empty
+from threading import Thread
+
+# Fitness quantiles and pipes passed histogram bins of every generation
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+HISTOGRAM_BINS = 20
+
+
+def summarize_generation(generation, fitness, pipes_passed, total_pipes, ticks, termination, seconds, phases=None):
+    # Everything about a generation that is worth plotting, in plain JSON types
+    fitness = np.asarray(fitness, dtype=float)
+    histogram, _ = np.histogram(pipes_passed, bins=HISTOGRAM_BINS, range=(0, total_pipes))
+    return {
+        "generation": generation,
+        "birds": len(fitness),
+        "fitness_min": float(fitness.min()),
+        "fitness_mean": float(fitness.mean()),
+        "fitness_max": float(fitness.max()),
+        "fitness_std": float(fitness.std()),
+        "fitness_quantiles": np.quantile(fitness, QUANTILES).tolist(),
+        "total_pipes": total_pipes,
+        "pipes_passed_max": float(np.max(pipes_passed)),
+        "pipes_passed_histogram": histogram.tolist(),
+        "ticks": ticks,
+        "termination": termination.name,
+        "seconds": seconds,
+        "phases": phases,
+    }
+
+
+class TelemetryWriter:
+    def __init__(self, log_directory="neat_logs", file_prefix="neat"):
+        # Newline delimited JSON, one record per line and generation
+        makedirs(log_directory, exist_ok=True)
+        self.file_path = join(
+            log_directory, "telemetry_{}_{}.jsonl".format(file_prefix, datetime.now().strftime("%Y_%m_%d-%H_%M"))
+        )
+
+        # Records are serialized and written by a background thread, in batches
+        self.queue = Queue()
+        self.thread = Thread(target=self.write_loop, daemon=True)
+        self.thread.start()
+
+    def write(self, record):
+        self.queue.put(record)
+
+    def write_loop(self):
+        with open(self.file_path, "a") as telemetry_file:
+            while True:
+                # Waiting for a record and taking every other record queued meanwhile
+                records = [self.queue.get()]
+                try:
+                    while True:
+                        records.append(self.queue.get_nowait())
+                except Empty:
+                    pass
+
+                closing = records[-1] is None
+                telemetry_file.write("".join(json.dumps(record) + "\n" for record in records if record is not None))
+                telemetry_file.flush()
+                for _ in records:
+                    self.queue.task_done()
+
+                if closing:
+                    return
+
+    def flush(self):
+        self.queue.join()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+
+def find_latest_telemetry(log_directory="neat_logs"):
+    files = sorted(glob(join(log_directory, "telemetry_*.jsonl")))
+    if len(files) == 0:
+        raise FileNotFoundError("No telemetry in {}".format(log_directory))
+    return files[-1]
+
+
+def read_telemetry(file_path):
+    # One record per generation, merging every record written about it
+    generations = {}
+    with open(file_path) as telemetry_file:
+        for line in telemetry_file:
+            if line.strip():
+                record = json.loads(line)
+                generations.setdefault(record["generation"], {}).update(record)
+    return [generations[generation] for generation in sorted(generations)]
+
+
+def plot_telemetry(records, output_file=None):
+    # Matplotlib is only needed to plot
+    import matplotlib.pyplot as plt
+
+    generations = [record["generation"] for record in records]
+    figure, ((fitness_axis, pipes_axis), (species_axis, timing_axis)) = plt.subplots(2, 2, figsize=(12, 8))
+
+    # Fitness distribution: extremes, mean and the interquartile range
+    quantiles = np.array([record["fitness_quantiles"] for record in records])
+    fitness_axis.fill_between(generations, quantiles[:, 1], quantiles[:, 3], alpha=0.3, label="25%-75%")
+    for key in ("fitness_max", "fitness_mean", "fitness_min"):
+        fitness_axis.plot(generations, [record[key] for record in records], label=key.split("_")[1])
+    fitness_axis.set_title("Fitness")
+    fitness_axis.legend()
+
+    # Pipes passed histogram of every generation
+    histograms = np.array([record["pipes_passed_histogram"] for record in records]).T
+    pipes_axis.imshow(
+        histograms, aspect="auto", origin="lower", cmap="viridis",
+        extent=(generations[0] - 0.5, generations[-1] + 0.5, 0, records[-1]["total_pipes"])
+    )
+    pipes_axis.set_title("Pipes passed")
+
+    # Species, only written when the population has a telemetry reporter
+    species = [(record["generation"], record["species"]) for record in records if "species" in record]
+    if species:
+        species_axis.plot(*zip(*species))
+    species_axis.set_title("Species")
+
+    # Seconds per generation, split in phases when the game was profiled
+    timing_axis.plot(generations, [record["seconds"] for record in records], label="total")
+    if records[-1].get("phases"):
+        for phase in records[-1]["phases"]:
+            timing_axis.plot(generations, [(record.get("phases") or {}).get(phase, 0) for record in records], label=phase)
+    timing_axis.set_title("Seconds per generation")
+    timing_axis.legend()
+
+    for axis in (fitness_axis, pipes_axis, species_axis, timing_axis):
+        axis.set_xlabel("Generation")
+    figure.tight_layout()
+
+    if output_file is not None:
+        figure.savefig(output_file)
+    else:
+        plt.show()
+    return figure